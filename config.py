@@ -8,6 +8,22 @@ Loads configuration from environment variables with sensible defaults.
 import os
 import sys
 
+# Bound once; every setting below is a single dict lookup
+_env = os.environ.get
+
+# Accepted values for enumerated settings (checked after normalizing case)
+VALID_DIRECTIONS = frozenset(('rx', 'tx', 'dual'))
+VALID_TRANSPORT_MODES = frozenset(('MQTT', 'MQTT_TLS', 'MQTT_WS', 'MQTT_WS_TLS'))
+
+# Separator line used by the error and summary printouts
+_SEP = "=" * 80
+
+# Truthy strings, with the common spellings listed so most lookups skip .lower()
+_TRUTHY_LOWER = frozenset(('true', '1', 'yes', 'on', 't', 'y'))
+_TRUTHY = _TRUTHY_LOWER | frozenset(
+    ('True', 'TRUE', 'Yes', 'YES', 'On', 'ON', 'T', 'Y')
+)
+
 
 def str_to_bool(value):
     """Convert string to boolean. Handles common string representations."""
@@ -15,7 +31,9 @@ def str_to_bool(value):
         return value
     if not value:
         return False
-    return value.lower() in ('true', '1', 'yes', 'on', 't', 'y')
+    if value in _TRUTHY:
+        return True
+    return value.lower() in _TRUTHY_LOWER
 
 
 def str_to_int(value, default=0):
@@ -26,84 +44,94 @@ def str_to_int(value, default=0):
         return default
 
 
-def parse_list(value):
-    """Parse comma-separated string into list, stripping whitespace."""
+def _load_int(name, default):
+    """Read an integer environment variable, falling back to default if unset or invalid."""
+    return str_to_int(_env(name), default)
+
+
+def parse_set(value):
+    """Parse comma-separated string into an uppercased frozenset for membership tests."""
     if not value:
-        return []
-    if isinstance(value, list):
-        return value
-    return [item.strip() for item in value.split(',') if item.strip()]
+        return frozenset()
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return frozenset(str(item).strip().upper() for item in value if str(item).strip())
+    return frozenset(item.strip().upper() for item in value.split(',') if item.strip())
+
+
+def is_int_code(item):
+    """Return True if item is a plain ASCII decimal code (isdigit() also passes e.g. '²', which int() rejects)."""
+    return item.isascii() and item.isdecimal()
+
+
+def parse_int_set(value):
+    """Parse comma-separated integer codes into a frozenset of ints, skipping non-numeric items."""
+    return frozenset(int(item) for item in parse_set(value) if is_int_code(item))
 
 
 # ==============================================================================
 # --- Core Identity ---
 # ==============================================================================
 
-MY_CALLSIGN = os.getenv('MY_CALLSIGN', 'YOUR_CALLSIGN')
+MY_CALLSIGN = _env('MY_CALLSIGN', 'YOUR_CALLSIGN')
 
 # ==============================================================================
 # --- Debugging ---
 # ==============================================================================
 
-DEBUG_MODE = str_to_bool(os.getenv('DEBUG_MODE', 'False'))
+DEBUG_MODE = str_to_bool(_env('DEBUG_MODE', 'False'))
 
 # ==============================================================================
 # --- MQTT Broker Configuration ---
 # ==============================================================================
 
 # PSKReporter Broker
-PSK_BROKER = os.getenv('PSK_BROKER', 'mqtt.pskreporter.info')
-PSK_TRANSPORT_MODE = os.getenv('PSK_TRANSPORT_MODE', 'MQTT_WS_TLS')
-PSK_TLS_INSECURE = str_to_bool(os.getenv('PSK_TLS_INSECURE', 'False'))
+PSK_BROKER = _env('PSK_BROKER', 'mqtt.pskreporter.info')
+PSK_TRANSPORT_MODE = _env('PSK_TRANSPORT_MODE', 'MQTT_WS_TLS')
+PSK_TLS_INSECURE = str_to_bool(_env('PSK_TLS_INSECURE', 'False'))
 
 # Home Assistant Broker
-HA_MQTT_BROKER = os.getenv('HA_MQTT_BROKER', 'YOUR_MQTT_BROKER_IP')
-HA_MQTT_PORT = str_to_int(os.getenv('HA_MQTT_PORT'), default=1883)
-HA_MQTT_USER = os.getenv('HA_MQTT_USER') or None
-HA_MQTT_PASS = os.getenv('HA_MQTT_PASS') or None
+HA_MQTT_BROKER = _env('HA_MQTT_BROKER', 'YOUR_MQTT_BROKER_IP')
+HA_MQTT_PORT = _load_int('HA_MQTT_PORT', 1883)
+HA_MQTT_USER = _env('HA_MQTT_USER') or None
+HA_MQTT_PASS = _env('HA_MQTT_PASS') or None
 
 # ==============================================================================
 # --- Script Operation Mode ---
 # ==============================================================================
 
-SCRIPT_DIRECTION = os.getenv('SCRIPT_DIRECTION', 'rx')
-MODES_FILTER = os.getenv('MODES_FILTER', '+')
+SCRIPT_DIRECTION = _env('SCRIPT_DIRECTION', 'rx')
+MODES_FILTER = _env('MODES_FILTER', '+')
 
 # ==============================================================================
 # --- Statistics Timing ---
 # ==============================================================================
 
-STATS_INTERVAL_WINDOW_SECONDS = str_to_int(
-    os.getenv('STATS_INTERVAL_WINDOW_SECONDS'),
-    default=900
-)
-STATS_UPDATE_INTERVAL_SECONDS = str_to_int(
-    os.getenv('STATS_UPDATE_INTERVAL_SECONDS'),
-    default=300
-)
+STATS_INTERVAL_WINDOW_SECONDS = _load_int('STATS_INTERVAL_WINDOW_SECONDS', 900)
+STATS_UPDATE_INTERVAL_SECONDS = _load_int('STATS_UPDATE_INTERVAL_SECONDS', 300)
 
 # ==============================================================================
 # --- Spot Sensor Control & Filtering ---
 # ==============================================================================
 
-ENABLE_SPOT_SENSORS = str_to_bool(os.getenv('ENABLE_SPOT_SENSORS', 'True'))
-SPOT_FILTER_MIN_DISTANCE_KM = str_to_int(
-    os.getenv('SPOT_FILTER_MIN_DISTANCE_KM'),
-    default=0
-)
+ENABLE_SPOT_SENSORS = str_to_bool(_env('ENABLE_SPOT_SENSORS', 'True'))
+SPOT_FILTER_MIN_DISTANCE_KM = _load_int('SPOT_FILTER_MIN_DISTANCE_KM', 0)
+# Most sender/receiver sessions kept in memory; the least recently heard is dropped beyond this
+SPOT_SESSION_MAX = _load_int('SPOT_SESSION_MAX', 10000)
 
-# Parse comma-separated lists for callsign and country filtering
-SPOT_ALLOW_CALLSIGNS = parse_list(os.getenv('SPOT_ALLOW_CALLSIGNS', ''))
-SPOT_FILTERED_CALLSIGNS = parse_list(os.getenv('SPOT_FILTERED_CALLSIGNS', ''))
-SPOT_ALLOW_COUNTRIES = parse_list(os.getenv('SPOT_ALLOW_COUNTRIES', ''))
-SPOT_FILTERED_COUNTRIES = parse_list(os.getenv('SPOT_FILTERED_COUNTRIES', ''))
+# Parse comma-separated callsign and country filters into sets, since the bridge
+# only ever tests membership against them. Country codes are ints to match the
+# ADIF numbers in PSKReporter spots.
+SPOT_ALLOW_CALLSIGNS = parse_set(_env('SPOT_ALLOW_CALLSIGNS', ''))
+SPOT_FILTERED_CALLSIGNS = parse_set(_env('SPOT_FILTERED_CALLSIGNS', ''))
+SPOT_ALLOW_COUNTRIES = parse_int_set(_env('SPOT_ALLOW_COUNTRIES', ''))
+SPOT_FILTERED_COUNTRIES = parse_int_set(_env('SPOT_FILTERED_COUNTRIES', ''))
 
 # ==============================================================================
 # --- Home Assistant Integration ---
 # ==============================================================================
 
-HA_DISCOVERY_PREFIX = os.getenv('HA_DISCOVERY_PREFIX', 'homeassistant')
-HA_ENTITY_BASE = os.getenv('HA_ENTITY_BASE', 'pskr')
+HA_DISCOVERY_PREFIX = _env('HA_DISCOVERY_PREFIX', 'homeassistant')
+HA_ENTITY_BASE = _env('HA_ENTITY_BASE', 'pskr')
 
 # ==============================================================================
 # --- Configuration Validation ---
@@ -112,7 +140,7 @@ HA_ENTITY_BASE = os.getenv('HA_ENTITY_BASE', 'pskr')
 def validate_config():
     """
     Validate required configuration values and provide helpful error messages.
-    Called at module import time to fail fast if misconfigured.
+    Called from init() so the bridge fails fast if misconfigured.
     """
     errors = []
 
@@ -130,18 +158,16 @@ def validate_config():
         )
 
     # Validate SCRIPT_DIRECTION
-    valid_directions = ['rx', 'tx', 'dual']
-    if SCRIPT_DIRECTION.lower() not in valid_directions:
+    if SCRIPT_DIRECTION.lower() not in VALID_DIRECTIONS:
         errors.append(
-            f"SCRIPT_DIRECTION must be one of {valid_directions}. "
+            f"SCRIPT_DIRECTION must be one of {sorted(VALID_DIRECTIONS)}. "
             f"Got: '{SCRIPT_DIRECTION}'"
         )
 
     # Validate PSK_TRANSPORT_MODE
-    valid_transport_modes = ['MQTT', 'MQTT_TLS', 'MQTT_WS', 'MQTT_WS_TLS']
-    if PSK_TRANSPORT_MODE.upper() not in valid_transport_modes:
+    if PSK_TRANSPORT_MODE.upper() not in VALID_TRANSPORT_MODES:
         errors.append(
-            f"PSK_TRANSPORT_MODE must be one of {valid_transport_modes}. "
+            f"PSK_TRANSPORT_MODE must be one of {sorted(VALID_TRANSPORT_MODES)}. "
             f"Got: '{PSK_TRANSPORT_MODE}'"
         )
 
@@ -164,31 +190,41 @@ def validate_config():
             f"Got: {STATS_UPDATE_INTERVAL_SECONDS}"
         )
 
+    # Country filters hold numeric ADIF codes; anything else would be silently ignored
+    for name in ('SPOT_ALLOW_COUNTRIES', 'SPOT_FILTERED_COUNTRIES'):
+        invalid = sorted(item for item in parse_set(_env(name, '')) if not is_int_code(item))
+        if invalid:
+            errors.append(
+                f"{name} must list numeric ADIF country codes. Got: {invalid}"
+            )
+
+    if SPOT_SESSION_MAX < 1:
+        errors.append(
+            f"SPOT_SESSION_MAX must be at least 1. Got: {SPOT_SESSION_MAX}"
+        )
+
     # If there are errors, print them and exit
     if errors:
-        print("=" * 80)
+        print(_SEP)
         print("CONFIGURATION ERRORS")
-        print("=" * 80)
+        print(_SEP)
         for i, error in enumerate(errors, 1):
             print(f"\n{i}. {error}")
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("Please fix the configuration errors above and try again.")
-        print("=" * 80)
+        print(_SEP)
         sys.exit(1)
 
 
-# Run validation when module is imported
-validate_config()
-
 # ==============================================================================
 # --- Configuration Summary ---
 # ==============================================================================
 
 def print_config_summary():
     """Print a summary of the loaded configuration for debugging."""
-    print("=" * 80)
+    print(_SEP)
     print("CONFIGURATION SUMMARY")
-    print("=" * 80)
+    print(_SEP)
     print(f"MY_CALLSIGN:              {MY_CALLSIGN}")
     print(f"DEBUG_MODE:               {DEBUG_MODE}")
     print(f"SCRIPT_DIRECTION:         {SCRIPT_DIRECTION.upper()}")
@@ -200,16 +236,22 @@ def print_config_summary():
 
     if ENABLE_SPOT_SENSORS:
         print(f"SPOT_FILTER_MIN_DIST:     {SPOT_FILTER_MIN_DISTANCE_KM} km")
-        print(f"SPOT_ALLOW_CALLSIGNS:     {SPOT_ALLOW_CALLSIGNS if SPOT_ALLOW_CALLSIGNS else 'Any'}")
-        print(f"SPOT_FILTERED_CALLSIGNS:  {SPOT_FILTERED_CALLSIGNS if SPOT_FILTERED_CALLSIGNS else 'None'}")
-        print(f"SPOT_ALLOW_COUNTRIES:     {SPOT_ALLOW_COUNTRIES if SPOT_ALLOW_COUNTRIES else 'Any'}")
-        print(f"SPOT_FILTERED_COUNTRIES:  {SPOT_FILTERED_COUNTRIES if SPOT_FILTERED_COUNTRIES else 'None'}")
+        print(f"SPOT_SESSION_MAX:         {SPOT_SESSION_MAX}")
+        print(f"SPOT_ALLOW_CALLSIGNS:     {sorted(SPOT_ALLOW_CALLSIGNS) if SPOT_ALLOW_CALLSIGNS else 'Any'}")
+        print(f"SPOT_FILTERED_CALLSIGNS:  {sorted(SPOT_FILTERED_CALLSIGNS) if SPOT_FILTERED_CALLSIGNS else 'None'}")
+        print(f"SPOT_ALLOW_COUNTRIES:     {sorted(SPOT_ALLOW_COUNTRIES) if SPOT_ALLOW_COUNTRIES else 'Any'}")
+        print(f"SPOT_FILTERED_COUNTRIES:  {sorted(SPOT_FILTERED_COUNTRIES) if SPOT_FILTERED_COUNTRIES else 'None'}")
 
     print(f"STATS_WINDOW:             {STATS_INTERVAL_WINDOW_SECONDS}s ({STATS_INTERVAL_WINDOW_SECONDS//60}min)")
     print(f"STATS_UPDATE_INTERVAL:    {STATS_UPDATE_INTERVAL_SECONDS}s ({STATS_UPDATE_INTERVAL_SECONDS//60}min)")
-    print("=" * 80)
+    print(_SEP)
 
 
-# Optionally print config summary if DEBUG_MODE is enabled
-if DEBUG_MODE:
-    print_config_summary()
+def init():
+    """
+    Validate the configuration and, in debug mode, print a summary.
+    Call once from the bridge entry point; importing this module has no side effects.
+    """
+    validate_config()
+    if DEBUG_MODE:
+        print_config_summary()
@@ -0,0 +1,251 @@
+"""Spot storage and running aggregates for the PSKReporter coordinator.
+
+Only the standard library is used here, so these pieces can be tested
+without Home Assistant.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_right
+from collections import Counter, deque
+from collections.abc import Callable
+from operator import attrgetter
+from typing import Any, NamedTuple
+
+
+class SpotData(NamedTuple):
+    """Represent a single spot (immutable once parsed)."""
+
+    sender_callsign: str
+    receiver_callsign: str
+    frequency: float
+    mode: str
+    snr: int
+    timestamp: float
+    sender_locator: str = ""
+    receiver_locator: str = ""
+    distance_km: float = 0.0
+    sender_dxcc: str = ""
+    receiver_dxcc: str = ""
+    # New fields from MQTT payload
+    band: str = ""  # Direct from payload 'b' field
+    sender_azimuth: int = 0  # Bearing from sender to receiver
+    receiver_azimuth: int = 0  # Bearing from receiver to sender
+    sequence: int = 0  # Sequence number for gap detection
+
+
+_timestamp = attrgetter("timestamp")
+
+
+class HyperLogLog:
+    """Fixed-memory distinct-count estimator for the global station tally.
+
+    Uses 2**p one-byte registers (4 KiB at p=12, about 1.6% standard error).
+    Python's string hash is salted per process, which is fine for counts
+    that never leave the process.
+    """
+
+    __slots__ = ("_alpha_mm", "_m", "_mask", "_rank_counts", "_registers", "_shift")
+
+    def __init__(self, p: int = 12) -> None:
+        """Initialize empty registers."""
+        self._m = 1 << p
+        self._shift = 64 - p
+        self._mask = (1 << self._shift) - 1
+        self._alpha_mm = 0.7213 / (1 + 1.079 / self._m) * self._m * self._m
+        self.clear()
+
+    def add(self, value: str) -> None:
+        """Record one value."""
+        h = hash(value) & 0xFFFFFFFFFFFFFFFF
+        idx = h >> self._shift
+        rank = self._shift - (h & self._mask).bit_length() + 1
+        old = self._registers[idx]
+        if rank > old:
+            self._registers[idx] = rank
+            self._rank_counts[old] -= 1
+            self._rank_counts[rank] += 1
+
+    def count(self) -> int:
+        """Return the estimated number of distinct values."""
+        # A histogram of register ranks keeps this at ~50 terms instead of 2**p
+        rank_counts = self._rank_counts
+        estimate = self._alpha_mm / sum(
+            n * 2.0 ** -rank for rank, n in enumerate(rank_counts) if n
+        )
+        if estimate <= 2.5 * self._m:
+            # Small-range correction (linear counting over empty registers)
+            zeros = rank_counts[0]
+            if zeros:
+                estimate = self._m * math.log(self._m / zeros)
+        return round(estimate)
+
+    def clear(self) -> None:
+        """Reset all registers."""
+        self._registers = bytearray(self._m)
+        self._rank_counts = [0] * (self._shift + 2)
+        self._rank_counts[0] = self._m
+
+
+class MessageRateCounter:
+    """Per-second message counts over a sliding window of whole seconds.
+
+    One bucket per second, indexed by second modulo the window.
+    """
+
+    __slots__ = ("_buckets", "_last_sec", "_window")
+
+    def __init__(self, window: int) -> None:
+        """Initialize empty buckets."""
+        self._window = window
+        self._buckets = [0] * window
+        self._last_sec = 0
+
+    def record(self, sec: int) -> None:
+        """Count one message received during second sec."""
+        if sec != self._last_sec:
+            # Zero the buckets for seconds skipped since the last message
+            buckets = self._buckets
+            window = self._window
+            for skipped in range(max(self._last_sec + 1, sec - window + 1), sec + 1):
+                buckets[skipped % window] = 0
+            self._last_sec = sec
+        self._buckets[sec % self._window] += 1
+
+    def count(self, now_sec: int) -> int:
+        """Sum the buckets that still fall inside the window ending at now_sec."""
+        buckets = self._buckets
+        window = self._window
+        # Buckets older than the window may not have been zeroed yet if the feed went quiet
+        return sum(
+            buckets[sec % window]
+            for sec in range(now_sec - window + 1, min(self._last_sec, now_sec) + 1)
+        )
+
+
+class SpotWindow:
+    """Stored spots with band, mode, station, SNR and distance aggregates.
+
+    The aggregates are updated on every insert and eviction, so reading them
+    never rescans the spots (except the max distance, see max_distance).
+    """
+
+    def __init__(self, max_spots: int, station_attr: str) -> None:
+        """Initialize an empty window.
+
+        station_attr names the SpotData field counted as the remote station.
+        """
+        self.spots: deque[SpotData] = deque()
+        self.max_spots = max_spots
+        self.station_attr = station_attr
+        self.snr_total = 0
+        self.band_counts: Counter[str] = Counter()
+        self.mode_counts: Counter[str] = Counter()
+        self.station_counts: Counter[str] = Counter()
+        self.last_spot_time = 0.0
+        # Set whenever a spot is stored or evicted; cleared by the reader
+        self.dirty = True
+        self._max_distance = 0.0
+        self._max_distance_stale = False
+
+    def __len__(self) -> int:
+        """Return the number of stored spots."""
+        return len(self.spots)
+
+    @property
+    def max_distance(self) -> float:
+        """Return the largest distance among stored spots."""
+        if self._max_distance_stale:
+            self._max_distance = max(
+                (spot.distance_km for spot in self.spots), default=0.0
+            )
+            self._max_distance_stale = False
+        return self._max_distance
+
+    def add(self, spot: SpotData, cutoff: float) -> bool:
+        """Store a spot and fold it into the aggregates.
+
+        PSKReporter delivers spots late and out of order, so the spots are kept
+        sorted by timestamp and spots already at or before cutoff are rejected.
+        Returns whether the spot was stored.
+        """
+        timestamp = spot.timestamp
+        if timestamp <= cutoff:
+            return False
+        spots = self.spots
+        if len(spots) >= self.max_spots:
+            if timestamp < spots[0].timestamp:
+                # Older than everything kept in a full window
+                return False
+            self._evict(spots.popleft())
+        if not spots or timestamp >= spots[-1].timestamp:
+            spots.append(spot)
+        else:
+            spots.insert(bisect_right(spots, timestamp, key=_timestamp), spot)
+        self.dirty = True
+        self.snr_total += spot.snr
+        self.band_counts[spot.band] += 1
+        self.mode_counts[spot.mode] += 1
+        self.station_counts[getattr(spot, self.station_attr)] += 1
+        if spot.distance_km > self._max_distance:
+            self._max_distance = spot.distance_km
+        if timestamp > self.last_spot_time:
+            self.last_spot_time = timestamp
+        return True
+
+    def evict_older_than(self, cutoff: float) -> None:
+        """Remove spots with a timestamp at or before cutoff."""
+        spots = self.spots
+        if not spots:
+            return
+        # Sorted by timestamp, so expired spots are always at the head
+        while spots and spots[0].timestamp <= cutoff:
+            self._evict(spots.popleft())
+        if not spots:
+            self._max_distance = 0.0
+            self._max_distance_stale = False
+            self.last_spot_time = 0.0
+
+    def _evict(self, spot: SpotData) -> None:
+        """Remove a spot from the aggregates."""
+        self.dirty = True
+        self.snr_total -= spot.snr
+        for counts, key in (
+            (self.band_counts, spot.band),
+            (self.mode_counts, spot.mode),
+            (self.station_counts, getattr(spot, self.station_attr)),
+        ):
+            # Prune at zero so modes/bands/stations that drop out don't linger
+            remaining = counts[key] - 1
+            if remaining:
+                counts[key] = remaining
+            else:
+                del counts[key]
+        # Only rescan for the maximum when the spot holding it leaves the window
+        if self._max_distance > 0 and spot.distance_km >= self._max_distance:
+            self._max_distance_stale = True
+
+
+def combine_checks(checks: list[Callable[[Any], bool]]) -> Callable[[Any], bool]:
+    """Fold a list of checks into one predicate, skipping the loop when possible."""
+    if not checks:
+        return lambda _spot: True
+    if len(checks) == 1:
+        return checks[0]
+    checks_tuple = tuple(checks)
+    return lambda s: all(check(s) for check in checks_tuple)
+
+
+def compile_topic_filter(modes: frozenset[str]) -> Callable[[re.Match[str]], bool] | None:
+    """Build a pre-parse check from the filters whose fields are in the topic.
+
+    Takes a match of the topic pattern with groups 1 band, 2 mode, 3 sender
+    and 4 receiver. Only the mode is checked: callsigns such as K1ABC/P are
+    encoded differently in topic levels, so callsign lists are left to the
+    full spot filter. Returns None if no filter applies.
+    """
+    if not modes:
+        return None
+    return lambda m: m[2] in modes
@@ -10,12 +10,12 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION, DOMAIN, MONITOR_GLOBAL
 from .coordinator import PSKReporterCoordinator
+from .entity import PSKReporterEntity
 
 
 async def async_setup_entry(
@@ -31,9 +31,7 @@ async def async_setup_entry(
     ])
 
 
-class PSKReporterFeedHealthBinarySensor(
-    CoordinatorEntity[PSKReporterCoordinator], BinarySensorEntity
-):
+class PSKReporterFeedHealthBinarySensor(PSKReporterEntity, BinarySensorEntity):
     """Binary sensor for PSKReporter feed health."""
 
     _attr_attribution = ATTRIBUTION
@@ -49,35 +47,20 @@ class PSKReporterFeedHealthBinarySensor(
             self._attr_unique_id = "global_monitor_feed_health"
         else:
             self._attr_unique_id = f"{coordinator.callsign}_{coordinator.direction}_feed_health"
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
-        if self.coordinator.monitor_type == MONITOR_GLOBAL:
-            return DeviceInfo(
-                identifiers={(DOMAIN, "global_monitor")},
-                name="PSKReporter - Global Monitor",
-                manufacturer="PSKReporter.info",
-                model="PSKReporter HA Bridge (Global)",
-                sw_version="2.1.1",
-                configuration_url="https://pskreporter.info",
-            )
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self.coordinator.callsign}_{self.coordinator.direction}")},
-            name=f"PSKReporter - {self.coordinator.callsign}",
-            manufacturer="PSKReporter.info",
-            model="PSKReporter HA Bridge",
-            sw_version="2.1.1",
-            configuration_url="https://pskreporter.info",
-        )
-
-    @property
-    def is_on(self) -> bool:
-        """Return true if feed is healthy (data flowing)."""
-        return self.coordinator.data.health.feed_healthy
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _update_from_data(self) -> None:
+        """Derive is_on and attributes from the current coordinator data."""
+        # On when the feed is healthy (data flowing)
+        self._attr_is_on = self.coordinator.data.health.feed_healthy
+        self._attr_extra_state_attributes = self._build_attributes()
+
+    def _state_value(self) -> Any:
+        """Return the value set by _update_from_data."""
+        return self._attr_is_on
+
+    def _build_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
         health = self.coordinator.data.health
         return {
@@ -85,6 +68,7 @@ class PSKReporterFeedHealthBinarySensor(
             "last_message_seconds_ago": round(health.feed_latency, 1),
             "messages_last_minute": health.messages_last_minute,
             "total_messages": health.total_messages,
+            "topic_filtered_messages": health.topic_filtered,
             "healthy_threshold_seconds": 60,
             "reason": self._get_health_reason(),
         }
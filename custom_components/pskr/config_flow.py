@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-import re
+import string
+from functools import lru_cache
 from typing import Any
 
 import voluptuous as vol
@@ -39,19 +40,42 @@ from .const import (
     MONITOR_PERSONAL,
 )
 
-CALLSIGN_REGEX = re.compile(r"^[A-Z0-9]{1,3}[0-9][A-Z0-9]{0,4}[A-Z](?:/[A-Z0-9]+)?$", re.IGNORECASE)
+# Translation table that deletes every legal callsign character
+_CALLSIGN_CHARS_DELETE = str.maketrans("", "", string.ascii_uppercase + string.digits)
 
 CONF_MONITOR_TYPE = "monitor_type"
 
 
+def _match_callsign(callsign: str) -> bool:
+    """Check an uppercased callsign's format using plain string ops.
+
+    Equivalent to ^[A-Z0-9]{1,3}[0-9][A-Z0-9]{0,4}[A-Z](?:/[A-Z0-9]+)?$
+    """
+    base, sep, suffix = callsign.partition("/")
+    length = len(base)
+    if not 3 <= length <= 9 or (sep and not suffix):
+        return False
+    # Anything left after deleting [A-Z0-9] is an illegal character (including a second "/")
+    if base.translate(_CALLSIGN_CHARS_DELETE) or suffix.translate(_CALLSIGN_CHARS_DELETE):
+        return False
+    if not base[-1].isalpha():
+        return False
+    # Needs a digit after a 1-3 char prefix, followed by at most 4 chars before the final letter
+    return any(base[i].isdigit() for i in range(max(1, length - 6), min(3, length - 2) + 1))
+
+
+@lru_cache(maxsize=128)
+def _validate_callsign_cached(callsign: str) -> str | None:
+    """Check a normalized callsign's format."""
+    return None if _match_callsign(callsign) else "invalid_callsign"
+
+
 def validate_callsign(callsign: str) -> str | None:
     """Validate amateur radio callsign format."""
     callsign = callsign.strip().upper()
     if not callsign:
         return "callsign_required"
-    if not CALLSIGN_REGEX.match(callsign):
-        return "invalid_callsign"
-    return None
+    return _validate_callsign_cached(callsign)
 
 
 class PSKReporterConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -63,6 +63,10 @@ DEFAULT_SPOT_TTL: Final = 900  # 15 minutes
 DEFAULT_COUNT_ONLY: Final = False
 DEFAULT_SAMPLE_RATE: Final = 10  # Process 1 in N messages for global mode
 
+# Spot buffer sizing: a full TTL window at the peak stored-spot rate
+PEAK_SPOT_RATE: Final = 50  # spots per second
+MAX_SPOTS: Final = DEFAULT_SPOT_TTL * PEAK_SPOT_RATE
+
 # Sensor update interval
 UPDATE_INTERVAL: Final = 30  # seconds
 
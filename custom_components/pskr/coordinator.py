@@ -2,22 +2,39 @@
 
 from __future__ import annotations
 
-import asyncio
+import bisect
 import json
 import logging
+import queue
+import re
 import ssl
+import sys
+import threading
 import time
-from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
+from functools import lru_cache
 from typing import Any
 
 import paho.mqtt.client as mqtt
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .aggregation import (
+    HyperLogLog,
+    MessageRateCounter,
+    SpotData,
+    SpotWindow,
+    combine_checks,
+    compile_topic_filter,
+)
 from .const import (
+    BAND_MAPPING,
     CONF_BAND_FILTER,
     CONF_CALLSIGN,
     CONF_CALLSIGN_ALLOW,
@@ -40,6 +57,7 @@ from .const import (
     DIRECTION_TX,
     DOMAIN,
     GLOBAL_TOPICS,
+    MAX_SPOTS,
     MONITOR_GLOBAL,
     MONITOR_PERSONAL,
     PSK_BROKER,
@@ -49,35 +67,50 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# orjson parses bytes natively; fall back to the stdlib parser (which also takes bytes).
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except covers both.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Distances are optional; without pyhamtools spots simply report 0 km
+try:
+    from pyhamtools.locator import calculate_distance as _calc_distance
+except ImportError:
+    _calc_distance = None
+
 # Health monitoring constants
 FEED_HEALTHY_THRESHOLD = 60  # seconds without messages = unhealthy
-MESSAGE_RATE_WINDOW = 60  # seconds for rate calculation
+MESSAGE_RATE_WINDOW = 60  # seconds for rate calculation (one counter bucket per second)
 SEQUENCE_GAP_THRESHOLD = 100  # report gaps larger than this
+NS_PER_SECOND = 1_000_000_000
 
+# Band edges from BAND_MAPPING as parallel tuples sorted by lower edge, for bisect lookups
+_SORTED_BANDS = sorted(BAND_MAPPING.items(), key=lambda kv: kv[1][0])
+_BAND_NAMES = tuple(name for name, _ in _SORTED_BANDS)
+_BAND_LOWS = tuple(low for _, (low, _high) in _SORTED_BANDS)
+_BAND_HIGHS = tuple(high for _, (_low, high) in _SORTED_BANDS)
 
-@dataclass
-class SpotData:
-    """Represent a single spot."""
-
-    sender_callsign: str
-    receiver_callsign: str
-    frequency: float
-    mode: str
-    snr: int
-    timestamp: float
-    sender_locator: str = ""
-    receiver_locator: str = ""
-    distance_km: float = 0.0
-    sender_dxcc: str = ""
-    receiver_dxcc: str = ""
-    # New fields from MQTT payload
-    band: str = ""  # Direct from payload 'b' field
-    sender_azimuth: int = 0  # Bearing from sender to receiver
-    receiver_azimuth: int = 0  # Bearing from receiver to sender
-    sequence: int = 0  # Sequence number for gap detection
+# Topic format: pskr/filter/v2/{band}/{mode}/{sender}/{receiver}/...
+# Groups: band, mode, sender, receiver (matched in place instead of splitting the topic)
+_TOPIC_RE = re.compile(r"pskr/filter/v2/([^/]+)/([^/]+)/([^/]+)/([^/]+)")
 
 
-@dataclass
+@lru_cache(maxsize=10_000)
+def _cached_distance(loc1: str, loc2: str) -> float:
+    """Distance in km between two normalized locators (callers sort the pair)."""
+    return _calc_distance(loc1, loc2)
+
+
+# Messages the consumer thread processes per hold of the spot lock
+DRAIN_BATCH_SIZE = 256
+
+# Coalesce message-driven refreshes to at most one per cooldown period
+REFRESH_COOLDOWN = 1.0  # seconds
+
+
+@dataclass(slots=True)
 class HealthMetrics:
     """Health monitoring metrics."""
 
@@ -99,6 +132,7 @@ class HealthMetrics:
     total_gap_size: int = 0  # Total missed messages
     parse_errors: int = 0  # Malformed message count
     incomplete_spots: int = 0  # Messages missing required fields
+    topic_filtered: int = 0  # Dropped by the topic mode prefilter before parsing
 
     # Subscription info
     subscribed_topics: list[str] = field(default_factory=list)
@@ -108,7 +142,7 @@ class HealthMetrics:
 class PSKReporterData:
     """Data from PSKReporter."""
 
-    spots: list[SpotData] = field(default_factory=list)
+    spots: tuple[SpotData, ...] = ()  # Snapshot, never the live buffer
     total_spots: int = 0
     unique_stations: int = 0
     most_active_band: str = "Unknown"
@@ -118,6 +152,7 @@ class PSKReporterData:
     spots_per_minute: float = 0.0
     band_counts: dict[str, int] = field(default_factory=dict)
     mode_counts: dict[str, int] = field(default_factory=dict)
+    band_percentages: dict[str, float] = field(default_factory=dict)  # Global mode only
     last_spot_time: float = 0.0
     connected: bool = False
     # Health metrics
@@ -141,6 +176,9 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REFRESH_COOLDOWN, immediate=False
+            ),
         )
         self.config_entry = entry
         self._callsign = entry.data.get(CONF_CALLSIGN, "").upper()
@@ -149,7 +187,7 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
         self._max_distance = entry.options.get(CONF_MAX_DISTANCE, 0)
         self._country_filter = entry.options.get(CONF_COUNTRY_FILTER, [])
         self._band_filter = entry.options.get(CONF_BAND_FILTER, [])
-        self._mode_filter = entry.options.get(CONF_MODE_FILTER, [])
+        self._mode_filter = frozenset(entry.options.get(CONF_MODE_FILTER, []))
         # Callsign and country allow/block lists (v2.1.0)
         self._callsign_allow = {c.upper() for c in entry.options.get(CONF_CALLSIGN_ALLOW, [])}
         self._callsign_block = {c.upper() for c in entry.options.get(CONF_CALLSIGN_BLOCK, [])}
@@ -161,27 +199,77 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
         if not self._callsign:
             self._monitor_type = MONITOR_GLOBAL
         self._count_only = entry.options.get(CONF_COUNT_ONLY, DEFAULT_COUNT_ONLY)
-        self._sample_rate = entry.options.get(CONF_SAMPLE_RATE, DEFAULT_SAMPLE_RATE)
-
-        self._spots: list[SpotData] = []
+        # Number selectors hand back floats; the countdown below needs an int >= 1
+        self._sample_rate = max(1, int(entry.options.get(CONF_SAMPLE_RATE, DEFAULT_SAMPLE_RATE)))
+        # Global and count-only monitors only tally; with sampling on there is no
+        # sequence tracking either, so the topic alone carries everything they need
+        self._aggregate_only = self._monitor_type == MONITOR_GLOBAL or self._count_only
+        self._count_from_topic = self._aggregate_only and self._sample_rate > 1
+
+        # Stored spots with running aggregates, updated on insert and eviction.
+        # The consumer thread inserts and the refresh evicts, both under _spots_lock,
+        # which also guards the global tallies.
+        # A clean window lets a refresh reuse the previous statistics and only
+        # swap in fresh health metrics.
+        self._window = SpotWindow(
+            MAX_SPOTS,
+            "receiver_callsign" if self._direction == DIRECTION_TX else "sender_callsign",
+        )
         self._mqtt_client: mqtt.Client | None = None
         self._connected = False
+        self._spots_lock = threading.Lock()
+        # Raw messages handed from the MQTT thread to the consumer thread, which
+        # decodes and filters them and only tells the event loop that data changed.
+        # _refresh_pending is set once a refresh is queued so bursts schedule only one.
+        self._rx_queue: queue.SimpleQueue[tuple[bytes, str] | None] = queue.SimpleQueue()
+        self._consumer: threading.Thread | None = None
+        self._refresh_pending = False
+        self._pending_lock = threading.Lock()
         self._stats_window = DEFAULT_STATS_WINDOW
         self._spot_ttl = DEFAULT_SPOT_TTL
 
         # Health tracking
         self._health = HealthMetrics()
-        self._message_times: deque[float] = deque(maxlen=1000)  # Track recent message times
+        # Internal bookkeeping uses monotonic nanoseconds; wall-clock values in
+        # HealthMetrics are derived from these when metrics are calculated.
+        # Per-second message counts for the last MESSAGE_RATE_WINDOW monotonic seconds
+        self._message_rate = MessageRateCounter(MESSAGE_RATE_WINDOW)
+        self._last_message_ns = 0
+        self._connected_ns = 0
         self._last_sequence: int | None = None  # For gap detection
-        self._startup_time = time.time()
-        self._message_counter = 0  # For rate limiting
+        self._startup_ns = time.monotonic_ns()
+        self._sample_countdown = self._sample_rate  # Process a message when this hits zero
         self._processed_messages = 0  # Processed after rate limiting
 
         # Global mode aggregation (count-only, no spot storage)
-        self._global_band_counts: dict[str, int] = defaultdict(int)
-        self._global_mode_counts: dict[str, int] = defaultdict(int)
-        self._global_unique_stations: set[str] = set()
-        self._last_window_reset = time.time()
+        self._global_band_counts: Counter[str] = Counter()
+        self._global_mode_counts: Counter[str] = Counter()
+        self._global_unique_stations = HyperLogLog()
+        self._last_window_reset_ns = time.monotonic_ns()
+
+        # Options changes reload the entry, so the predicate is built once here
+        self._include_spot, self._include_distance = self._compile_filter()
+        self._topic_filter = self._compile_topic_filter()
+
+        # Shared by every entity of this entry; built once rather than per access
+        if self._monitor_type == MONITOR_GLOBAL:
+            self._device_info = DeviceInfo(
+                identifiers={(DOMAIN, "global_monitor")},
+                name="PSKReporter - Global Monitor",
+                manufacturer="PSKReporter.info",
+                model="PSKReporter HA Bridge (Global)",
+                sw_version="2.1.1",
+                configuration_url="https://pskreporter.info",
+            )
+        else:
+            self._device_info = DeviceInfo(
+                identifiers={(DOMAIN, f"{self._callsign}_{self._direction}")},
+                name=f"PSKReporter - {self._callsign}",
+                manufacturer="PSKReporter.info",
+                model="PSKReporter HA Bridge",
+                sw_version="2.1.1",
+                configuration_url="https://pskreporter.info",
+            )
 
         self.data = PSKReporterData(monitor_type=self._monitor_type)
 
@@ -200,6 +288,11 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
         """Return the monitor type (personal or global)."""
         return self._monitor_type
 
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device shared by this entry's entities."""
+        return self._device_info
+
     async def async_config_entry_first_refresh(self) -> None:
         """Perform first refresh and start MQTT connection."""
         await self._async_start_mqtt()
@@ -225,6 +318,10 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
 
     async def _async_start_mqtt(self) -> None:
         """Start MQTT connection to PSKReporter."""
+        self._consumer = threading.Thread(
+            target=self._consume_spot_queue, name="pskr-spot-consumer", daemon=True
+        )
+        self._consumer.start()
         try:
             await self.hass.async_add_executor_job(self._setup_and_connect_mqtt)
             target = self._callsign if self._callsign else "global monitor"
@@ -245,6 +342,7 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
         if reason_code == 0:
             self._connected = True
             self._health.connected_at = time.time()
+            self._connected_ns = time.monotonic_ns()
             _LOGGER.info("Connected to PSKReporter MQTT")
             self._subscribe_topics()
         else:
@@ -275,32 +373,26 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
         if self._mqtt_client is None:
             return
 
-        self._health.subscribed_topics = []
-
         if self._monitor_type == MONITOR_GLOBAL:
             # Global mode: subscribe to FT8 + FT4 (covers 90%+ of activity)
-            for topic in GLOBAL_TOPICS:
-                self._mqtt_client.subscribe(topic, qos=0)
-                self._health.subscribed_topics.append(topic)
-                _LOGGER.info("Subscribed to global topic: %s", topic)
+            topics = list(GLOBAL_TOPICS)
+        else:
+            # Personal mode: subscribe to callsign-specific topics
+            callsign = self._callsign
+            topics = []
+            if self._direction in (DIRECTION_RX, DIRECTION_DUAL):
+                # RX: any sender -> my callsign as receiver
+                topics.append(f"pskr/filter/v2/+/+/+/{callsign}/#")
+            if self._direction in (DIRECTION_TX, DIRECTION_DUAL):
+                # TX: my callsign as sender -> any receiver
+                topics.append(f"pskr/filter/v2/+/+/{callsign}/+/#")
+
+        self._health.subscribed_topics = topics
+        if not topics:
             return
-
-        # Personal mode: subscribe to callsign-specific topics
-        callsign = self._callsign
-
-        if self._direction in (DIRECTION_RX, DIRECTION_DUAL):
-            # RX: any sender -> my callsign as receiver
-            topic_rx = f"pskr/filter/v2/+/+/+/{callsign}/#"
-            self._mqtt_client.subscribe(topic_rx, qos=0)
-            self._health.subscribed_topics.append(topic_rx)
-            _LOGGER.info("Subscribed to RX topic: %s", topic_rx)
-
-        if self._direction in (DIRECTION_TX, DIRECTION_DUAL):
-            # TX: my callsign as sender -> any receiver
-            topic_tx = f"pskr/filter/v2/+/+/{callsign}/+/#"
-            self._mqtt_client.subscribe(topic_tx, qos=0)
-            self._health.subscribed_topics.append(topic_tx)
-            _LOGGER.info("Subscribed to TX topic: %s", topic_tx)
+        # One SUBSCRIBE packet for all topics
+        self._mqtt_client.subscribe([(topic, 0) for topic in topics])
+        _LOGGER.info("Subscribed to topics: %s", ", ".join(topics))
 
     def _on_message(
         self,
@@ -309,24 +401,84 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
         msg: mqtt.MQTTMessage,
     ) -> None:
         """Handle incoming MQTT message."""
-        now = time.time()
+        now = time.monotonic_ns()
         self._health.total_messages += 1
-        self._health.last_message_time = now
-        self._message_times.append(now)
-        self._message_counter += 1
+        self._last_message_ns = now
+        self._message_rate.record(now // NS_PER_SECOND)
 
         # Rate limiting: skip messages based on sample rate
-        if self._sample_rate > 1 and self._message_counter % self._sample_rate != 0:
+        # Health bookkeeping above still sees every message; only processing is sampled
+        self._sample_countdown -= 1
+        if self._sample_countdown:
             return
+        self._sample_countdown = self._sample_rate
 
         self._processed_messages += 1
 
+        if self._topic_filter is not None:
+            match = _TOPIC_RE.match(msg.topic)
+            if match and not self._topic_filter(match):
+                self._health.topic_filtered += 1
+                return
+
+        # Parsing happens on the consumer thread; the network thread only enqueues
+        self._rx_queue.put((msg.payload, msg.topic))
+
+    def _consume_spot_queue(self) -> None:
+        """Decode, filter and store queued messages until the shutdown sentinel."""
+        get = self._rx_queue.get
+        get_nowait = self._rx_queue.get_nowait
+        while (item := get()) is not None:
+            # Take whatever else is already queued, so one lock hold covers the burst
+            batch = [item]
+            while len(batch) < DRAIN_BATCH_SIZE:
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    break
+                batch.append(item)
+            accepted = False
+            with self._spots_lock:
+                for payload, topic in batch:
+                    accepted |= self._process_message(payload, topic)
+            if accepted:
+                self._notify_spots_changed()
+            if item is None:
+                break
+
+    def _notify_spots_changed(self) -> None:
+        """Ask the event loop for a refresh unless one is already on its way."""
+        with self._pending_lock:
+            if self._refresh_pending:
+                return
+            self._refresh_pending = True
+        self.hass.loop.call_soon_threadsafe(self._request_refresh)
+
+    @callback
+    def _request_refresh(self) -> None:
+        """Request a debounced refresh, so a burst still yields one statistics pass."""
+        with self._pending_lock:
+            self._refresh_pending = False
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _process_message(self, raw_payload: bytes, topic: str) -> bool:
+        """Parse and record one message. Return True if it changed the data."""
+        if self._count_from_topic:
+            match = _TOPIC_RE.match(topic)
+            if match:
+                self._count_global_spot(*match.groups())
+                return True
+
         try:
-            payload = json.loads(msg.payload.decode("utf-8"))
+            payload = _json_loads(raw_payload)
 
             # Track sequence gaps (only meaningful for non-sampled messages)
             if self._sample_rate == 1 and "sq" in payload:
-                seq = int(payload["sq"])
+                seq = payload["sq"]
+                if type(seq) is not int:
+                    seq = int(seq)
                 if self._last_sequence is not None:
                     gap = seq - self._last_sequence - 1
                     if gap > 0 and gap < SEQUENCE_GAP_THRESHOLD:
@@ -336,36 +488,42 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
                 self._last_sequence = seq
 
             # Global mode or count-only: lightweight aggregation
-            if self._monitor_type == MONITOR_GLOBAL or self._count_only:
+            if self._aggregate_only:
                 self._process_global_spot(payload)
-                asyncio.run_coroutine_threadsafe(
-                    self.async_request_refresh(), self.hass.loop
-                )
-                return
+                return True
 
             # Personal mode with spot storage
-            spot = self._parse_spot(payload, msg.topic)
+            spot = self._parse_spot(payload, topic)
             if spot is None:
                 self._health.incomplete_spots += 1
-            elif self._should_include_spot(spot):
-                self._spots.append(spot)
-                asyncio.run_coroutine_threadsafe(
-                    self.async_request_refresh(), self.hass.loop
-                )
+            elif self._include_spot(spot):
+                # Distance is the costly field, so it is only filled in for
+                # spots that passed every other filter
+                if spot.sender_locator and spot.receiver_locator:
+                    spot = spot._replace(
+                        distance_km=self._calculate_distance(
+                            spot.sender_locator, spot.receiver_locator
+                        )
+                    )
+                if self._include_distance(spot) and self._window.add(
+                    spot, time.time() - self._spot_ttl
+                ):
+                    return True
         except json.JSONDecodeError:
             self._health.parse_errors += 1
-            _LOGGER.debug("Failed to parse MQTT message: %s", msg.payload)
+            _LOGGER.debug("Failed to parse MQTT message: %s", raw_payload)
         except Exception as err:
             self._health.parse_errors += 1
             _LOGGER.debug("Error processing spot: %s", err)
+        return False
 
     def _process_global_spot(self, payload: dict) -> None:
         """Lightweight spot processing for global/count-only mode."""
-        band = payload.get("b", "Unknown")
-        mode = payload.get("md", "Unknown")
-        sender = payload.get("sc", "")
-        receiver = payload.get("rc", "")
+        get = payload.get
+        self._count_global_spot(get("b", "Unknown"), get("md", "Unknown"), get("sc", ""), get("rc", ""))
 
+    def _count_global_spot(self, band: str, mode: str, sender: str, receiver: str) -> None:
+        """Add one spot to the global band, mode and station tallies."""
         self._global_band_counts[band] += 1
         self._global_mode_counts[mode] += 1
         if sender:
@@ -375,30 +533,36 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
 
     def _parse_spot(self, payload: dict, _topic: str) -> SpotData | None:
         """Parse spot data from MQTT payload."""
+        get = payload.get
         try:
             # Extract callsigns from payload (matching Docker script)
-            sender = payload.get("sc", "")
-            receiver = payload.get("rc", "")
-
+            sender = get("sc")
+            receiver = get("rc")
             if not sender or not receiver:
                 _LOGGER.debug("Missing sender/receiver in payload: %s", payload)
                 return None
-
-            frequency = float(payload.get("f", 0)) / 1000000
-            mode = payload.get("md", "UNKNOWN")
-            snr = int(payload.get("rp", 0))
-            sender_locator = payload.get("sl", "")
-            receiver_locator = payload.get("rl", "")
-
-            # Calculate distance if both locators available
-            distance_km = 0.0
-            if sender_locator and receiver_locator:
-                distance_km = self._calculate_distance(sender_locator, receiver_locator)
-
-            # Get band directly from payload, fallback to calculation
-            band = payload.get("b", "")
-            if not band:
-                band = self._get_band_from_frequency(frequency)
+            # Callsigns recur constantly; interning lets stored spots and the
+            # station counter share one string per station
+            sender = sys.intern(sender)
+            receiver = sys.intern(receiver)
+
+            # Numeric fields arrive typed from JSON; only coerce the odd string value
+            frequency = get("f", 0)
+            if type(frequency) not in (int, float):
+                frequency = float(frequency)
+            frequency /= 1000000
+            snr = get("rp", 0)
+            if type(snr) is not int:
+                snr = int(snr)
+            sequence = get("sq", 0)
+            if type(sequence) is not int:
+                sequence = int(sequence)
+
+            # Get band directly from payload, fallback to calculation. Band and
+            # mode come from a handful of values, so stored spots share them too
+            band = get("b")
+            band = sys.intern(band) if band else self._get_band_from_frequency(frequency)
+            mode = sys.intern(get("md", "UNKNOWN"))
 
             return SpotData(
                 sender_callsign=sender,
@@ -406,115 +570,128 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
                 frequency=frequency,
                 mode=mode,
                 snr=snr,
-                timestamp=payload.get("t", time.time()),
-                sender_locator=sender_locator,
-                receiver_locator=receiver_locator,
-                distance_km=distance_km,
-                sender_dxcc=str(payload.get("sa", "")),
-                receiver_dxcc=str(payload.get("ra", "")),
+                timestamp=get("t") or time.time(),
+                sender_locator=get("sl", ""),
+                receiver_locator=get("rl", ""),
+                # distance_km is filled in after the field filters pass
+                sender_dxcc=str(get("sa", "")),
+                receiver_dxcc=str(get("ra", "")),
                 band=band,
                 # Note: azimuth fields left at default (0) - could be calculated from locators
                 # using pyhamtools.locator.calculate_heading() in future enhancement
-                sequence=int(payload.get("sq", 0)),
+                sequence=sequence,
             )
-        except (KeyError, ValueError, TypeError) as err:
+        except (ValueError, TypeError) as err:
             _LOGGER.debug("Failed to parse spot: %s", err)
             return None
 
     def _calculate_distance(self, loc1: str, loc2: str) -> float:
         """Calculate distance between two Maidenhead locators."""
+        if _calc_distance is None:
+            return 0.0
         try:
-            from pyhamtools.locator import calculate_distance
-
             # Truncate to 6 chars for calculation (matching Docker)
             loc1 = loc1[:6].upper() if len(loc1) >= 4 else ""
             loc2 = loc2[:6].upper() if len(loc2) >= 4 else ""
 
             if len(loc1) >= 4 and len(loc2) >= 4:
-                return calculate_distance(loc1, loc2)
+                # Distance is symmetric, so order the pair for better cache hits
+                if loc2 < loc1:
+                    loc1, loc2 = loc2, loc1
+                return _cached_distance(loc1, loc2)
         except Exception as err:
             _LOGGER.debug("Distance calculation failed: %s", err)
         return 0.0
 
-    def _should_include_spot(self, spot: SpotData) -> bool:
-        """Check if spot passes configured filters."""
-        # Distance filtering
-        if self._min_distance > 0 and spot.distance_km < self._min_distance:
-            return False
-        if self._max_distance > 0 and spot.distance_km > self._max_distance:
-            return False
+    def _compile_filter(
+        self,
+    ) -> tuple[Callable[[SpotData], bool], Callable[[SpotData], bool]]:
+        """Build spot predicates containing only the filters that are configured.
+
+        Returns (field_filter, distance_filter). The field filter only reads
+        payload fields, so it runs before the locator distance is computed.
+        """
+        field_checks: list[Callable[[SpotData], bool]] = []
+        distance_checks: list[Callable[[SpotData], bool]] = []
+        min_distance = self._min_distance
+        max_distance = self._max_distance
+        modes = self._mode_filter
+        callsign_block = frozenset(self._callsign_block)
+        callsign_allow = frozenset(self._callsign_allow)
+        country_block = frozenset(self._country_block)
+        country_allow = frozenset(self._country_allow)
+
         # Mode filtering
-        if self._mode_filter and spot.mode not in self._mode_filter:
-            return False
+        if modes:
+            field_checks.append(lambda s: s.mode in modes)
         # Callsign block list (exclude if either station is blocked)
-        if self._callsign_block:
-            sender_upper = spot.sender_callsign.upper()
-            receiver_upper = spot.receiver_callsign.upper()
-            if sender_upper in self._callsign_block or receiver_upper in self._callsign_block:
-                return False
+        if callsign_block:
+            field_checks.append(
+                lambda s: s.sender_callsign.upper() not in callsign_block
+                and s.receiver_callsign.upper() not in callsign_block
+            )
         # Callsign allow list (only include if at least one station is allowed)
-        if self._callsign_allow:
-            sender_upper = spot.sender_callsign.upper()
-            receiver_upper = spot.receiver_callsign.upper()
-            if sender_upper not in self._callsign_allow and receiver_upper not in self._callsign_allow:
-                return False
+        if callsign_allow:
+            field_checks.append(
+                lambda s: s.sender_callsign.upper() in callsign_allow
+                or s.receiver_callsign.upper() in callsign_allow
+            )
         # Country block list (exclude if either station's country is blocked)
-        if self._country_block and (
-            spot.sender_dxcc in self._country_block or spot.receiver_dxcc in self._country_block
-        ):
-            return False
+        if country_block:
+            field_checks.append(
+                lambda s: s.sender_dxcc not in country_block and s.receiver_dxcc not in country_block
+            )
         # Country allow list (only include if at least one station's country is allowed)
-        if self._country_allow:
-            return spot.sender_dxcc in self._country_allow or spot.receiver_dxcc in self._country_allow
-        return True
+        if country_allow:
+            field_checks.append(
+                lambda s: s.sender_dxcc in country_allow or s.receiver_dxcc in country_allow
+            )
+        # Distance filtering
+        if min_distance > 0:
+            distance_checks.append(lambda s: s.distance_km >= min_distance)
+        if max_distance > 0:
+            distance_checks.append(lambda s: s.distance_km <= max_distance)
+
+        return combine_checks(field_checks), combine_checks(distance_checks)
+
+    def _compile_topic_filter(self) -> Callable[[re.Match[str]], bool] | None:
+        """Build a pre-parse check from the filters whose fields are in the topic.
+
+        The mode is encoded in the topic, so stored-spot monitors can drop
+        those messages before JSON parsing. Anything that passes is still
+        checked by the full spot filter. Returns None if nothing applies.
+        """
+        if self._aggregate_only:
+            return None
+        return compile_topic_filter(self._mode_filter)
 
     def _get_band_from_frequency(self, freq_mhz: float) -> str:
         """Determine band from frequency."""
-        band_ranges = {
-            "160m": (1.8, 2.0),
-            "80m": (3.5, 4.0),
-            "60m": (5.3, 5.4),
-            "40m": (7.0, 7.3),
-            "30m": (10.1, 10.15),
-            "20m": (14.0, 14.35),
-            "17m": (18.068, 18.168),
-            "15m": (21.0, 21.45),
-            "12m": (24.89, 24.99),
-            "10m": (28.0, 29.7),
-            "6m": (50.0, 54.0),
-            "4m": (70.0, 70.5),
-            "2m": (144.0, 148.0),
-            "70cm": (420.0, 450.0),
-        }
-        for band, (low, high) in band_ranges.items():
-            if low <= freq_mhz <= high:
-                return band
+        i = bisect.bisect_right(_BAND_LOWS, freq_mhz) - 1
+        if i >= 0 and freq_mhz <= _BAND_HIGHS[i]:
+            return _BAND_NAMES[i]
         return "Unknown"
 
-    def _cleanup_old_spots(self) -> None:
-        """Remove spots older than TTL."""
-        cutoff = time.time() - self._spot_ttl
-        self._spots = [s for s in self._spots if s.timestamp > cutoff]
-
     def _calculate_health_metrics(self) -> HealthMetrics:
         """Calculate current health metrics."""
-        now = time.time()
+        now = time.monotonic_ns()
 
         # Connection uptime
-        if self._connected and self._health.connected_at > 0:
-            self._health.connection_uptime = now - self._health.connected_at
+        if self._connected and self._connected_ns:
+            self._health.connection_uptime = (now - self._connected_ns) / NS_PER_SECOND
         else:
             self._health.connection_uptime = 0.0
 
-        # Feed latency (time since last message)
-        if self._health.last_message_time > 0:
-            self._health.feed_latency = now - self._health.last_message_time
+        # Feed latency (time since last message); the wall-clock time is derived from it
+        if self._last_message_ns:
+            self._health.feed_latency = (now - self._last_message_ns) / NS_PER_SECOND
+            self._health.last_message_time = time.time() - self._health.feed_latency
         else:
-            self._health.feed_latency = now - self._startup_time  # Never received a message
+            # Never received a message
+            self._health.feed_latency = (now - self._startup_ns) / NS_PER_SECOND
 
         # Messages in last minute
-        cutoff = now - MESSAGE_RATE_WINDOW
-        self._health.messages_last_minute = sum(1 for t in self._message_times if t > cutoff)
+        self._health.messages_last_minute = self._message_rate.count(now // NS_PER_SECOND)
 
         # Feed health determination
         # Feed is healthy if:
@@ -530,113 +707,107 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
 
     def _reset_global_stats_if_needed(self) -> None:
         """Reset global stats if window has expired."""
-        now = time.time()
-        if now - self._last_window_reset > self._stats_window:
+        now = time.monotonic_ns()
+        if now - self._last_window_reset_ns > self._stats_window * NS_PER_SECOND:
             self._global_band_counts.clear()
             self._global_mode_counts.clear()
             self._global_unique_stations.clear()
-            self._last_window_reset = now
+            self._last_window_reset_ns = now
 
     def _calculate_statistics(self) -> PSKReporterData:
         """Calculate statistics from current spots."""
         health = self._calculate_health_metrics()
 
-        # Global mode or count-only: use aggregated counters
-        if self._monitor_type == MONITOR_GLOBAL or self._count_only:
-            self._reset_global_stats_if_needed()
-
-            most_active_band = (
-                max(self._global_band_counts, key=self._global_band_counts.get)
-                if self._global_band_counts else "Unknown"
-            )
-            most_active_mode = (
-                max(self._global_mode_counts, key=self._global_mode_counts.get)
-                if self._global_mode_counts else "Unknown"
-            )
-            total_spots = sum(self._global_band_counts.values())
-
-            return PSKReporterData(
-                total_spots=total_spots,
-                unique_stations=len(self._global_unique_stations),
-                most_active_band=most_active_band,
-                most_active_mode=most_active_mode,
-                band_counts=dict(self._global_band_counts),
-                mode_counts=dict(self._global_mode_counts),
-                connected=self._connected,
-                health=health,
-                monitor_type=self._monitor_type,
-                sample_rate=self._sample_rate,
-                processed_messages=self._processed_messages,
-                global_unique_stations=len(self._global_unique_stations),
-            )
+        # The consumer thread updates the window and global tallies under this lock
+        with self._spots_lock:
+            # Global mode or count-only: use aggregated counters
+            if self._aggregate_only:
+                self._reset_global_stats_if_needed()
+                global_bands = self._global_band_counts
+                global_modes = self._global_mode_counts
+                band_counts = dict(global_bands)
+                mode_counts = dict(global_modes)
+                most_active_band = global_bands.most_common(1)[0][0] if global_bands else "Unknown"
+                most_active_mode = global_modes.most_common(1)[0][0] if global_modes else "Unknown"
+                total_spots = global_bands.total()
+                # One shared denominator for every per-band sensor
+                band_percentages = (
+                    {band: round(count * 100 / total_spots, 1) for band, count in band_counts.items()}
+                    if total_spots
+                    else {}
+                )
+                global_unique = self._global_unique_stations.count()
+
+                return PSKReporterData(
+                    total_spots=total_spots,
+                    unique_stations=global_unique,
+                    most_active_band=most_active_band,
+                    most_active_mode=most_active_mode,
+                    band_counts=band_counts,
+                    mode_counts=mode_counts,
+                    band_percentages=band_percentages,
+                    connected=self._connected,
+                    health=health,
+                    monitor_type=self._monitor_type,
+                    sample_rate=self._sample_rate,
+                    processed_messages=self._processed_messages,
+                    global_unique_stations=global_unique,
+                )
 
-        # Personal mode with spot storage
-        self._cleanup_old_spots()
+            # Personal mode with spot storage: read the running aggregates.
+            # The stats window and spot TTL are both 15 minutes, so the retained
+            # spots are exactly the spots in the statistics window.
+            window = self._window
+            window.evict_older_than(time.time() - self._spot_ttl)
+            if not window.dirty:
+                # Nothing stored or expired since the last refresh: skip the snapshots
+                return replace(self.data, connected=self._connected, health=health)
+            window.dirty = False
+            count = len(window)
+            if not count:
+                return PSKReporterData(
+                    connected=self._connected,
+                    health=health,
+                    monitor_type=self._monitor_type,
+                )
 
-        if not self._spots:
-            return PSKReporterData(
-                connected=self._connected,
-                health=health,
-                monitor_type=self._monitor_type,
-            )
+            # Frozen copy so entities never see the buffer mutate under them
+            spots_snapshot = tuple(window.spots)
+            band_counts = dict(window.band_counts)
+            mode_counts = dict(window.mode_counts)
+            most_active_band = window.band_counts.most_common(1)[0][0]
+            most_active_mode = window.mode_counts.most_common(1)[0][0]
+            unique_stations = len(window.station_counts)
+            avg_snr = window.snr_total / count
+            max_distance = window.max_distance
+            last_spot_time = window.last_spot_time
 
-        stats_cutoff = time.time() - self._stats_window
-        recent_spots = [s for s in self._spots if s.timestamp > stats_cutoff]
+            time_range_minutes = self._stats_window / 60
+            spots_per_minute = count / time_range_minutes if time_range_minutes > 0 else 0
 
-        if not recent_spots:
             return PSKReporterData(
-                spots=self._spots,
-                total_spots=len(self._spots),
+                spots=spots_snapshot,
+                total_spots=count,
+                unique_stations=unique_stations,
+                most_active_band=most_active_band,
+                most_active_mode=most_active_mode,
+                max_distance_km=max_distance,
+                avg_snr=round(avg_snr, 1),
+                spots_per_minute=round(spots_per_minute, 2),
+                band_counts=band_counts,
+                mode_counts=mode_counts,
+                last_spot_time=last_spot_time,
                 connected=self._connected,
                 health=health,
                 monitor_type=self._monitor_type,
             )
 
-        unique_stations: set[str] = set()
-        band_counts: dict[str, int] = defaultdict(int)
-        mode_counts: dict[str, int] = defaultdict(int)
-        total_snr = 0
-        max_distance = 0.0
-
-        for spot in recent_spots:
-            if self._direction == DIRECTION_TX:
-                unique_stations.add(spot.receiver_callsign)
-            else:
-                unique_stations.add(spot.sender_callsign)
-
-            # Use band from spot (now populated from payload or calculated)
-            band = spot.band if spot.band else self._get_band_from_frequency(spot.frequency)
-            band_counts[band] += 1
-            mode_counts[spot.mode] += 1
-            total_snr += spot.snr
-            if spot.distance_km > max_distance:
-                max_distance = spot.distance_km
-
-        most_active_band = max(band_counts, key=band_counts.get) if band_counts else "Unknown"
-        most_active_mode = max(mode_counts, key=mode_counts.get) if mode_counts else "Unknown"
-        avg_snr = total_snr / len(recent_spots) if recent_spots else 0
-        time_range_minutes = self._stats_window / 60
-        spots_per_minute = len(recent_spots) / time_range_minutes if time_range_minutes > 0 else 0
-
-        return PSKReporterData(
-            spots=self._spots,
-            total_spots=len(recent_spots),
-            unique_stations=len(unique_stations),
-            most_active_band=most_active_band,
-            most_active_mode=most_active_mode,
-            max_distance_km=max_distance,
-            avg_snr=round(avg_snr, 1),
-            spots_per_minute=round(spots_per_minute, 2),
-            band_counts=dict(band_counts),
-            mode_counts=dict(mode_counts),
-            last_spot_time=max(s.timestamp for s in recent_spots),
-            connected=self._connected,
-            health=health,
-            monitor_type=self._monitor_type,
-        )
-
     async def _async_update_data(self) -> PSKReporterData:
-        """Fetch data from coordinator."""
+        """Fetch data from coordinator.
+
+        A refresh after new spots snapshots the whole window, which is O(N) in
+        stored spots, so statistics are calculated in the executor.
+        """
         return await self.hass.async_add_executor_job(self._calculate_statistics)
 
     async def async_shutdown(self) -> None:
@@ -645,3 +816,7 @@ class PSKReporterCoordinator(DataUpdateCoordinator[PSKReporterData]):
             self._mqtt_client.loop_stop()
             self._mqtt_client.disconnect()
             _LOGGER.info("Disconnected from PSKReporter MQTT")
+        if self._consumer is not None:
+            # Queued after the last message, so the consumer finishes what it has first
+            self._rx_queue.put(None)
+            self._consumer = None
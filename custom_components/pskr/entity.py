@@ -0,0 +1,35 @@
+"""Base entity for PSKReporter HA Bridge."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import PSKReporterCoordinator
+
+
+class PSKReporterEntity(CoordinatorEntity[PSKReporterCoordinator]):
+    """Coordinator entity that writes its state only when it changed."""
+
+    # Availability, value and attributes as last written
+    _written_state: tuple[Any, ...] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute state once per coordinator update; write only if it changed."""
+        self._update_from_data()
+        state = (self.available, self._state_value(), self._attr_extra_state_attributes)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        super()._handle_coordinator_update()
+
+    def _update_from_data(self) -> None:
+        """Derive the state and attributes from the current coordinator data."""
+        raise NotImplementedError
+
+    def _state_value(self) -> Any:
+        """Return the value set by _update_from_data."""
+        raise NotImplementedError
@@ -5,6 +5,8 @@ from __future__ import annotations
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -16,22 +18,41 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfLength, UnitOfTime
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION, DOMAIN, HF_BANDS, MONITOR_GLOBAL
 from .coordinator import PSKReporterCoordinator, PSKReporterData
+from .entity import PSKReporterEntity
+
+
+@lru_cache(maxsize=64)
+def _ts_to_iso(timestamp: float) -> str:
+    """Format a repeating Unix timestamp (connected_at) as local ISO 8601."""
+    return datetime.fromtimestamp(timestamp).isoformat()
 
 
 @dataclass(frozen=True, kw_only=True)
 class PSKReporterSensorEntityDescription(SensorEntityDescription):
     """Describes PSKReporter sensor entity."""
 
+    # Plain field reads use operator.attrgetter (C-level) rather than a lambda
     value_fn: Callable[[PSKReporterData], Any]
     attr_fn: Callable[[PSKReporterData], dict[str, Any]] | None = None
 
 
+# Shared by the personal and global sensor sets
+CONNECTION_STATUS_DESCRIPTION = PSKReporterSensorEntityDescription(
+    key="connection_status",
+    translation_key="connection_status",
+    value_fn=lambda data: "Connected" if data.connected else "Disconnected",
+    attr_fn=lambda data: {
+        "reconnect_count": data.health.reconnect_count,
+        "last_disconnect_reason": data.health.last_disconnect_reason,
+        "subscribed_topics": data.health.subscribed_topics,
+    },
+)
+
 # Main activity sensors
 SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
     PSKReporterSensorEntityDescription(
@@ -39,25 +60,25 @@ SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="total_spots",
         native_unit_of_measurement="spots",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.total_spots,
+        value_fn=attrgetter("total_spots"),
     ),
     PSKReporterSensorEntityDescription(
         key="unique_stations",
         translation_key="unique_stations",
         native_unit_of_measurement="stations",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.unique_stations,
+        value_fn=attrgetter("unique_stations"),
     ),
     PSKReporterSensorEntityDescription(
         key="most_active_band",
         translation_key="most_active_band",
-        value_fn=lambda data: data.most_active_band,
+        value_fn=attrgetter("most_active_band"),
         attr_fn=lambda data: {"band_counts": data.band_counts},
     ),
     PSKReporterSensorEntityDescription(
         key="most_active_mode",
         translation_key="most_active_mode",
-        value_fn=lambda data: data.most_active_mode,
+        value_fn=attrgetter("most_active_mode"),
         attr_fn=lambda data: {"mode_counts": data.mode_counts},
     ),
     PSKReporterSensorEntityDescription(
@@ -80,7 +101,7 @@ SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="spots_per_minute",
         native_unit_of_measurement="spots/min",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.spots_per_minute,
+        value_fn=attrgetter("spots_per_minute"),
     ),
     PSKReporterSensorEntityDescription(
         key="last_spot",
@@ -92,16 +113,7 @@ SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
             else None
         ),
     ),
-    PSKReporterSensorEntityDescription(
-        key="connection_status",
-        translation_key="connection_status",
-        value_fn=lambda data: "Connected" if data.connected else "Disconnected",
-        attr_fn=lambda data: {
-            "reconnect_count": data.health.reconnect_count,
-            "last_disconnect_reason": data.health.last_disconnect_reason,
-            "subscribed_topics": data.health.subscribed_topics,
-        },
-    ),
+    CONNECTION_STATUS_DESCRIPTION,
 )
 
 # Health monitoring sensors (diagnostic category)
@@ -113,6 +125,7 @@ HEALTH_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         value_fn=lambda data: "Healthy" if data.health.feed_healthy else "Unhealthy",
         attr_fn=lambda data: {
             "last_message_time": (
+                # Derived from the current time on every refresh, so never cached
                 datetime.fromtimestamp(data.health.last_message_time).isoformat()
                 if data.health.last_message_time > 0
                 else None
@@ -127,7 +140,7 @@ HEALTH_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         native_unit_of_measurement="msg/min",
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.health.messages_last_minute,
+        value_fn=attrgetter("health.messages_last_minute"),
         attr_fn=lambda data: {
             "total_messages": data.health.total_messages,
         },
@@ -151,7 +164,7 @@ HEALTH_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         value_fn=lambda data: round(data.health.connection_uptime, 0) if data.connected else 0,
         attr_fn=lambda data: {
             "connected_at": (
-                datetime.fromtimestamp(data.health.connected_at).isoformat()
+                _ts_to_iso(data.health.connected_at)
                 if data.health.connected_at > 0
                 else None
             ),
@@ -162,7 +175,7 @@ HEALTH_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="reconnect_count",
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.health.reconnect_count,
+        value_fn=attrgetter("health.reconnect_count"),
         attr_fn=lambda data: {
             "last_disconnect_reason": data.health.last_disconnect_reason or "N/A",
         },
@@ -172,7 +185,7 @@ HEALTH_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="sequence_gaps",
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.health.sequence_gaps,
+        value_fn=attrgetter("health.sequence_gaps"),
         attr_fn=lambda data: {
             "total_gap_size": data.health.total_gap_size,
             "description": "Number of detected message sequence gaps (missed messages)",
@@ -183,7 +196,7 @@ HEALTH_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="parse_errors",
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.health.parse_errors,
+        value_fn=attrgetter("health.parse_errors"),
         attr_fn=lambda data: {
             "incomplete_spots": data.health.incomplete_spots,
             "description": "Messages that failed to parse",
@@ -198,7 +211,7 @@ GLOBAL_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="global_spots_sampled",
         native_unit_of_measurement="spots",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.health.total_messages,
+        value_fn=attrgetter("health.total_messages"),
         attr_fn=lambda data: {
             "sample_rate": f"1:{data.sample_rate}",
             "processed_messages": data.processed_messages,
@@ -209,38 +222,23 @@ GLOBAL_SENSOR_DESCRIPTIONS: tuple[PSKReporterSensorEntityDescription, ...] = (
         translation_key="global_unique_stations",
         native_unit_of_measurement="stations",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.global_unique_stations,
+        value_fn=attrgetter("global_unique_stations"),
     ),
     PSKReporterSensorEntityDescription(
         key="global_most_active_band",
         translation_key="global_most_active_band",
-        value_fn=lambda data: (
-            max(data.band_counts, key=data.band_counts.get)
-            if data.band_counts
-            else "Unknown"
-        ),
+        # Computed once per refresh by the coordinator
+        value_fn=attrgetter("most_active_band"),
         attr_fn=lambda data: {"band_counts": data.band_counts},
     ),
     PSKReporterSensorEntityDescription(
         key="global_most_active_mode",
         translation_key="global_most_active_mode",
-        value_fn=lambda data: (
-            max(data.mode_counts, key=data.mode_counts.get)
-            if data.mode_counts
-            else "Unknown"
-        ),
+        # Computed once per refresh by the coordinator
+        value_fn=attrgetter("most_active_mode"),
         attr_fn=lambda data: {"mode_counts": data.mode_counts},
     ),
-    PSKReporterSensorEntityDescription(
-        key="connection_status",
-        translation_key="connection_status",
-        value_fn=lambda data: "Connected" if data.connected else "Disconnected",
-        attr_fn=lambda data: {
-            "reconnect_count": data.health.reconnect_count,
-            "last_disconnect_reason": data.health.last_disconnect_reason,
-            "subscribed_topics": data.health.subscribed_topics,
-        },
-    ),
+    CONNECTION_STATUS_DESCRIPTION,
 )
 
 
@@ -252,29 +250,24 @@ async def async_setup_entry(
     """Set up PSKReporter sensors based on a config entry."""
     coordinator: PSKReporterCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[PSKReporterSensor] = []
-
     if coordinator.monitor_type == MONITOR_GLOBAL:
-        # Global mode: add global sensors
-        for description in GLOBAL_SENSOR_DESCRIPTIONS:
-            entities.append(PSKReporterSensor(coordinator, description))
-
-        # Add per-band sensors for HF bands
-        for band in HF_BANDS:
-            entities.append(PSKReporterBandSensor(coordinator, band))
+        # Global mode: global sensors plus per-band sensors for HF bands
+        entities: list[SensorEntity] = [
+            PSKReporterSensor(coordinator, description) for description in GLOBAL_SENSOR_DESCRIPTIONS
+        ]
+        entities += [PSKReporterBandSensor(coordinator, band) for band in HF_BANDS]
     else:
-        # Personal mode: add main activity sensors
-        for description in SENSOR_DESCRIPTIONS:
-            entities.append(PSKReporterSensor(coordinator, description))
+        # Personal mode: main activity sensors
+        entities = [PSKReporterSensor(coordinator, description) for description in SENSOR_DESCRIPTIONS]
 
-    # Add health sensors for both modes
-    for description in HEALTH_SENSOR_DESCRIPTIONS:
-        entities.append(PSKReporterSensor(coordinator, description))
+    # Health sensors for both modes
+    entities += [PSKReporterSensor(coordinator, description) for description in HEALTH_SENSOR_DESCRIPTIONS]
 
-    async_add_entities(entities)
+    # State comes from the coordinator's data, so no per-entity update before adding
+    async_add_entities(entities, update_before_add=False)
 
 
-class PSKReporterSensor(CoordinatorEntity[PSKReporterCoordinator], SensorEntity):
+class PSKReporterSensor(PSKReporterEntity, SensorEntity):
     """Representation of a PSKReporter sensor."""
 
     entity_description: PSKReporterSensorEntityDescription
@@ -295,42 +288,22 @@ class PSKReporterSensor(CoordinatorEntity[PSKReporterCoordinator], SensorEntity)
             self._attr_unique_id = f"global_monitor_{description.key}"
         else:
             self._attr_unique_id = f"{coordinator.callsign}_{coordinator.direction}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
+
+    def _update_from_data(self) -> None:
+        """Evaluate value_fn/attr_fn so state reads between updates are plain attributes."""
+        data = self.coordinator.data
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(data)
+        self._attr_extra_state_attributes = description.attr_fn(data) if description.attr_fn else None
+
+    def _state_value(self) -> Any:
+        """Return the value set by _update_from_data."""
+        return self._attr_native_value
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
-        if self.coordinator.monitor_type == MONITOR_GLOBAL:
-            return DeviceInfo(
-                identifiers={(DOMAIN, "global_monitor")},
-                name="PSKReporter - Global Monitor",
-                manufacturer="PSKReporter.info",
-                model="PSKReporter HA Bridge (Global)",
-                sw_version="2.1.1",
-                configuration_url="https://pskreporter.info",
-            )
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{self.coordinator.callsign}_{self.coordinator.direction}")},
-            name=f"PSKReporter - {self.coordinator.callsign}",
-            manufacturer="PSKReporter.info",
-            model="PSKReporter HA Bridge",
-            sw_version="2.1.1",
-            configuration_url="https://pskreporter.info",
-        )
-
-    @property
-    def native_value(self) -> Any:
-        """Return the state of the sensor."""
-        return self.entity_description.value_fn(self.coordinator.data)
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return extra state attributes."""
-        if self.entity_description.attr_fn:
-            return self.entity_description.attr_fn(self.coordinator.data)
-        return None
-
-
-class PSKReporterBandSensor(CoordinatorEntity[PSKReporterCoordinator], SensorEntity):
+
+class PSKReporterBandSensor(PSKReporterEntity, SensorEntity):
     """Sensor for per-band activity in global mode."""
 
     _attr_attribution = ATTRIBUTION
@@ -351,36 +324,19 @@ class PSKReporterBandSensor(CoordinatorEntity[PSKReporterCoordinator], SensorEnt
         self._attr_translation_placeholders = {"band": band}
         # Fallback name if translation not available
         self._attr_name = f"{band} Activity"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "global_monitor")},
-            name="PSKReporter - Global Monitor",
-            manufacturer="PSKReporter.info",
-            model="PSKReporter HA Bridge (Global)",
-            sw_version="2.1.1",
-            configuration_url="https://pskreporter.info",
-        )
-
-    @property
-    def native_value(self) -> int:
-        """Return the spot count for this band."""
-        return self.coordinator.data.band_counts.get(self._band, 0)
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
-        return {
+        self._attr_device_info = coordinator.device_info
+        self._update_from_data()
+
+    def _update_from_data(self) -> None:
+        """Read this band's count and share from the coordinator data."""
+        data = self.coordinator.data
+        self._attr_native_value = data.band_counts.get(self._band, 0)
+        self._attr_extra_state_attributes = {
             "band": self._band,
-            "percentage": self._calculate_percentage(),
+            # Share of all sampled spots, computed once per refresh by the coordinator
+            "percentage": data.band_percentages.get(self._band, 0.0),
         }
 
-    def _calculate_percentage(self) -> float:
-        """Calculate what percentage of total spots this band represents."""
-        total = sum(self.coordinator.data.band_counts.values())
-        if total == 0:
-            return 0.0
-        band_count = self.coordinator.data.band_counts.get(self._band, 0)
-        return round((band_count / total) * 100, 1)
+    def _state_value(self) -> Any:
+        """Return the value set by _update_from_data."""
+        return self._attr_native_value
@@ -0,0 +1,169 @@
+"""Tests for the spot window, rate counter, HyperLogLog and topic prefilter."""
+
+import importlib.util
+import re
+from pathlib import Path
+
+import pytest
+
+# Loaded by path: importing the package would pull in Home Assistant
+_SPEC = importlib.util.spec_from_file_location(
+    "pskr_aggregation",
+    Path(__file__).resolve().parent.parent / "custom_components" / "pskr" / "aggregation.py",
+)
+aggregation = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(aggregation)
+
+SpotData = aggregation.SpotData
+TOPIC_RE = r"pskr/filter/v2/([^/]+)/([^/]+)/([^/]+)/([^/]+)"
+
+
+def make_spot(sender, timestamp, band="20m", mode="FT8", snr=-10, distance_km=0.0):
+    """Return a spot of sender heard by W1AW."""
+    return SpotData(
+        sender_callsign=sender,
+        receiver_callsign="W1AW",
+        frequency=14.074,
+        mode=mode,
+        snr=snr,
+        timestamp=timestamp,
+        distance_km=distance_km,
+        band=band,
+    )
+
+
+def test_window_aggregates_follow_inserts_and_evictions():
+    """Counts, SNR total and max distance track the stored spots."""
+    window = aggregation.SpotWindow(100, "sender_callsign")
+    window.add(make_spot("K1ABC", 100, snr=-10, distance_km=500), 0)
+    window.add(make_spot("G4ABC", 110, band="40m", snr=-20, distance_km=5000), 0)
+    window.add(make_spot("K1ABC", 120, mode="FT4", snr=0, distance_km=100), 0)
+
+    assert len(window) == 3
+    assert window.snr_total == -30
+    assert window.band_counts == {"20m": 2, "40m": 1}
+    assert window.mode_counts == {"FT8": 2, "FT4": 1}
+    assert window.station_counts == {"K1ABC": 2, "G4ABC": 1}
+    assert window.max_distance == 5000
+    assert window.last_spot_time == 120
+
+    window.evict_older_than(110)
+    assert [spot.timestamp for spot in window.spots] == [120]
+    assert window.snr_total == 0
+    assert window.band_counts == {"20m": 1}
+    assert window.station_counts == {"K1ABC": 1}
+    assert window.max_distance == 100
+
+    window.evict_older_than(120)
+    assert len(window) == 0
+    assert window.max_distance == 0
+    assert window.last_spot_time == 0
+
+
+def test_window_drops_oldest_when_full():
+    """A full window evicts its oldest spot from the aggregates too."""
+    window = aggregation.SpotWindow(2, "sender_callsign")
+    for i, sender in enumerate(("A1A", "B1B", "C1C")):
+        window.add(make_spot(sender, 100 + i), 0)
+
+    assert [spot.sender_callsign for spot in window.spots] == ["B1B", "C1C"]
+    assert window.station_counts == {"B1B": 1, "C1C": 1}
+
+
+def test_window_out_of_order_timestamps():
+    """Late spots are kept in timestamp order so eviction never skips an expired one."""
+    window = aggregation.SpotWindow(100, "sender_callsign")
+    for sender, timestamp in (("A1A", 200), ("B1B", 150), ("C1C", 300), ("D1D", 250)):
+        assert window.add(make_spot(sender, timestamp), 100)
+
+    assert [spot.timestamp for spot in window.spots] == [150, 200, 250, 300]
+
+    # B1B arrived after A1A but expires first; a head-only sweep must still find it
+    window.evict_older_than(200)
+    assert [spot.sender_callsign for spot in window.spots] == ["D1D", "C1C"]
+    assert window.station_counts == {"C1C": 1, "D1D": 1}
+
+
+def test_window_rejects_expired_spots():
+    """Spots already past the cutoff, or older than a full window, are not stored."""
+    window = aggregation.SpotWindow(2, "sender_callsign")
+    assert not window.add(make_spot("A1A", 100), 100)
+    assert window.add(make_spot("B1B", 200), 100)
+    assert window.add(make_spot("C1C", 300), 100)
+    assert not window.add(make_spot("D1D", 150), 100)
+    assert window.add(make_spot("E1E", 250), 100)
+
+    assert [spot.sender_callsign for spot in window.spots] == ["E1E", "C1C"]
+    assert window.station_counts == {"C1C": 1, "E1E": 1}
+
+
+def test_window_dirty_flag():
+    """Stores and evictions mark the window dirty; the reader clears it."""
+    window = aggregation.SpotWindow(10, "sender_callsign")
+    window.dirty = False
+    window.add(make_spot("K1ABC", 100), 0)
+    assert window.dirty
+    window.dirty = False
+    window.evict_older_than(50)
+    assert not window.dirty
+    window.evict_older_than(100)
+    assert window.dirty
+
+
+def test_rate_counter_window():
+    """Messages fall out of the count once their second leaves the window."""
+    counter = aggregation.MessageRateCounter(60)
+    for sec in (1000, 1000, 1001, 1030):
+        counter.record(sec)
+
+    assert counter.count(1030) == 4
+    assert counter.count(1059) == 4
+    assert counter.count(1060) == 2
+    assert counter.count(1089) == 1
+    assert counter.count(1090) == 0
+
+    # Recording after a long gap must not resurrect the stale buckets
+    counter.record(1200)
+    assert counter.count(1200) == 1
+
+
+def test_hyperloglog_estimate():
+    """The distinct count is close to exact and ignores repeats."""
+    hll = aggregation.HyperLogLog()
+    assert hll.count() == 0
+    for _ in range(3):
+        for i in range(1000):
+            hll.add(f"CALL{i}")
+    assert hll.count() == pytest.approx(1000, rel=0.05)
+
+    for i in range(50_000):
+        hll.add(f"STATION{i}")
+    assert hll.count() == pytest.approx(51_000, rel=0.05)
+
+    hll.clear()
+    assert hll.count() == 0
+
+
+def test_combine_checks():
+    """No checks accept everything; several checks must all pass."""
+    assert aggregation.combine_checks([])(object())
+    both = aggregation.combine_checks([lambda n: n > 1, lambda n: n < 5])
+    assert both(3)
+    assert not both(0)
+    assert not both(7)
+
+
+def test_topic_filter_modes():
+    """The mode prefilter reads the mode from the topic."""
+    match = re.compile(TOPIC_RE).match
+    topic_filter = aggregation.compile_topic_filter(frozenset({"FT8"}))
+    assert topic_filter(match("pskr/filter/v2/20m/FT8/K1ABC/W1AW/0/0/0/0"))
+    assert not topic_filter(match("pskr/filter/v2/20m/CW/K1ABC/W1AW/0/0/0/0"))
+    assert aggregation.compile_topic_filter(frozenset()) is None
+
+
+def test_topic_filter_ignores_portable_callsign_encoding():
+    """A portable call is spelled differently in the topic, so callsigns are not prefiltered."""
+    match = re.compile(TOPIC_RE).match("pskr/filter/v2/20m/FT8/K1ABC.P/W1AW/0/0/0/0")
+    assert match[3] != "K1ABC/P"
+    assert aggregation.compile_topic_filter(frozenset({"FT8"}))(match)
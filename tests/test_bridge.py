@@ -0,0 +1,126 @@
+"""Tests for the Docker bridge's spot sensor filter and session cap."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("paho.mqtt.client")
+pytest.importorskip("pyhamtools")
+
+BRIDGE_PATH = Path(__file__).resolve().parent.parent / "pskr-ha-bridge.py"
+
+
+def load_bridge(monkeypatch, **env):
+    """Load the bridge script as a module with a minimal valid configuration plus env."""
+    monkeypatch.setenv("MY_CALLSIGN", "W1AW")
+    monkeypatch.setenv("HA_MQTT_BROKER", "localhost")
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.syspath_prepend(str(BRIDGE_PATH.parent))
+    # config.py reads the environment at import, so drop any copy loaded with other settings
+    monkeypatch.delitem(sys.modules, "config", raising=False)
+    spec = importlib.util.spec_from_file_location("pskr_ha_bridge", BRIDGE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def bridge(monkeypatch):
+    """The bridge loaded in the default RX direction."""
+    return load_bridge(monkeypatch)
+
+
+def configure_filter(bridge, monkeypatch, **settings):
+    """Override filter settings on the loaded bridge and rebuild its predicate."""
+    monkeypatch.setattr(bridge, "ENABLE_SPOT_SENSORS", True)
+    for name, value in settings.items():
+        monkeypatch.setattr(bridge, name, value)
+    monkeypatch.setattr(bridge, "FILTERED_CALLS_UPPER", bridge.SPOT_FILTERED_CALLSIGNS)
+    monkeypatch.setattr(bridge, "ALLOW_CALLS_UPPER", bridge.SPOT_ALLOW_CALLSIGNS)
+    monkeypatch.setattr(bridge, "FILTERED_COUNTRIES_SET", bridge.SPOT_FILTERED_COUNTRIES)
+    monkeypatch.setattr(bridge, "ALLOW_COUNTRIES_SET", bridge.SPOT_ALLOW_COUNTRIES)
+    return bridge.build_spot_sensor_filter()
+
+
+def test_spot_filter_disabled(bridge, monkeypatch):
+    """With spot sensors off nothing passes."""
+    monkeypatch.setattr(bridge, "ENABLE_SPOT_SENSORS", False)
+    assert not bridge.build_spot_sensor_filter()("K1ABC", "W1AW", 291, 291, 500.0)
+
+
+def test_spot_filter_no_checks(bridge, monkeypatch):
+    """With no filters configured every spot passes."""
+    spot_filter = configure_filter(
+        bridge, monkeypatch,
+        SPOT_FILTER_MIN_DISTANCE_KM=0,
+        SPOT_FILTERED_CALLSIGNS=frozenset(), SPOT_ALLOW_CALLSIGNS=frozenset(),
+        SPOT_FILTERED_COUNTRIES=frozenset(), SPOT_ALLOW_COUNTRIES=frozenset(),
+    )
+    assert spot_filter("K1ABC", "W1AW", 291, 291, None)
+
+
+def test_spot_filter_combined(bridge, monkeypatch):
+    """Distance, callsign and country checks all have to pass."""
+    spot_filter = configure_filter(
+        bridge, monkeypatch,
+        SPOT_FILTER_MIN_DISTANCE_KM=1000,
+        SPOT_FILTERED_CALLSIGNS=frozenset({"N0BAD"}), SPOT_ALLOW_CALLSIGNS=frozenset(),
+        SPOT_FILTERED_COUNTRIES=frozenset({339}), SPOT_ALLOW_COUNTRIES=frozenset(),
+    )
+    assert spot_filter("g4abc", "W1AW", 223, 291, 5000.0)
+    assert not spot_filter("G4ABC", "W1AW", 223, 291, 500.0)
+    assert not spot_filter("G4ABC", "W1AW", 223, 291, None)
+    assert not spot_filter("n0bad", "W1AW", 291, 291, 5000.0)
+    assert not spot_filter("JA1ABC", "W1AW", 339, 291, 9000.0)
+
+
+def test_spot_filter_allow_lists(bridge, monkeypatch):
+    """Allow lists pass a spot when either station matches."""
+    spot_filter = configure_filter(
+        bridge, monkeypatch,
+        SPOT_FILTER_MIN_DISTANCE_KM=0,
+        SPOT_FILTERED_CALLSIGNS=frozenset(), SPOT_ALLOW_CALLSIGNS=frozenset({"K1ABC"}),
+        SPOT_FILTERED_COUNTRIES=frozenset(), SPOT_ALLOW_COUNTRIES=frozenset({291}),
+    )
+    assert spot_filter("K1ABC", "G4ABC", 291, 223, None)
+    assert not spot_filter("K2ABC", "G4ABC", 291, 223, None)
+    assert not spot_filter("K1ABC", "G4ABC", 223, 223, None)
+
+
+def test_session_lru_cap(bridge, monkeypatch):
+    """Past SPOT_SESSION_MAX the least recently heard session is evicted."""
+    monkeypatch.setattr(bridge, "SPOT_SESSION_MAX", 2)
+    record = bridge.record_spot_session
+    with bridge.state_lock:
+        _, is_new = record(("K1ABC", "W1AW"), -10, 100, "FN42", "FN31")
+        assert is_new
+        record(("G4ABC", "W1AW"), -12, 101, "IO91", "FN31")
+        # Hearing K1ABC again makes G4ABC the least recently heard
+        session, is_new = record(("K1ABC", "W1AW"), -4, 102, "FN42", "FN31")
+        assert not is_new
+        bridge.pending_spot_updates[("G4ABC", "W1AW")] = (-12, {})
+        record(("JA1ABC", "W1AW"), -20, 103, "PM95", "FN31")
+
+        assert list(bridge.spot_session_stats) == [("K1ABC", "W1AW"), ("JA1ABC", "W1AW")]
+        assert ("G4ABC", "W1AW") not in bridge.pending_spot_updates
+
+    assert session.count == 2
+    assert (session.snr_min, session.snr_max, session.snr_sum) == (-10, -4, -14)
+    assert (session.first_seen, session.last_seen) == (100, 102)
+
+
+def test_import_skips_lookup_init(bridge):
+    """Importing the script does not load the pyhamtools country data."""
+    assert bridge.lookuplib is None
+    assert not bridge.pyhamtools_lookups_ok
+
+
+@pytest.mark.parametrize(("direction", "per_direction"), [("rx", 5000), ("dual", 2500)])
+def test_spot_history_cap_split_in_dual_mode(monkeypatch, direction, per_direction):
+    """Dual mode keeps MAX_SPOT_HISTORY spots in total across both directions."""
+    bridge = load_bridge(monkeypatch, SCRIPT_DIRECTION=direction)
+    assert bridge.spots_history["rx"].maxlen == per_direction
+    assert bridge.spots_history["tx"].maxlen == per_direction
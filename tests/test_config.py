@@ -6,71 +6,69 @@ Tests environment variable loading, type conversion, and validation.
 """
 
 import os
+import subprocess
 import sys
-import importlib
 
+# Repository root, so the child interpreter can import config.py
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def test_scenario(name, env_vars, should_fail=False):
+# Runs in a fresh interpreter per scenario: config.py reads the environment at import time
+SCENARIO_CODE = """
+import config
+config.init()
+print(f"   MY_CALLSIGN: {config.MY_CALLSIGN}")
+print(f"   HA_MQTT_BROKER: {config.HA_MQTT_BROKER}")
+print(f"   SCRIPT_DIRECTION: {config.SCRIPT_DIRECTION}")
+print(f"   DEBUG_MODE: {config.DEBUG_MODE} (type: {type(config.DEBUG_MODE).__name__})")
+print(f"   HA_MQTT_PORT: {config.HA_MQTT_PORT} (type: {type(config.HA_MQTT_PORT).__name__})")
+print(f"   ENABLE_SPOT_SENSORS: {config.ENABLE_SPOT_SENSORS} (type: {type(config.ENABLE_SPOT_SENSORS).__name__})")
+print(f"   SPOT_ALLOW_CALLSIGNS: {config.SPOT_ALLOW_CALLSIGNS} (type: {type(config.SPOT_ALLOW_CALLSIGNS).__name__})")
+"""
+
+
+def run_scenario(name, env_vars, should_fail=False):
     """
-    Test a configuration scenario.
+    Test a configuration scenario in a separate Python process.
 
     Args:
         name: Description of the test scenario
-        env_vars: Dictionary of environment variables to set
+        env_vars: Dictionary of environment variables to set (None removes the variable)
         should_fail: Whether this scenario should fail validation
     """
     print("\n" + "=" * 80)
     print(f"TEST: {name}")
     print("=" * 80)
 
-    # Clear any existing config module
-    if 'config' in sys.modules:
-        del sys.modules['config']
-
-    # Set environment variables for this test
-    original_env = {}
+    env = dict(os.environ)
     for key, value in env_vars.items():
-        original_env[key] = os.environ.get(key)
         if value is None:
-            os.environ.pop(key, None)
+            env.pop(key, None)
         else:
-            os.environ[key] = str(value)
+            env[key] = str(value)
 
-    try:
-        # Import config module (this triggers validation)
-        import config
+    proc = subprocess.run(
+        [sys.executable, "-c", SCENARIO_CODE],
+        env=env,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
 
+    if proc.returncode == 0:
         if should_fail:
             print("❌ FAILED: Expected validation error but config loaded successfully")
             return False
-        else:
-            print("✅ PASSED: Configuration loaded successfully")
-
-            # Print some key values
-            print(f"   MY_CALLSIGN: {config.MY_CALLSIGN}")
-            print(f"   HA_MQTT_BROKER: {config.HA_MQTT_BROKER}")
-            print(f"   SCRIPT_DIRECTION: {config.SCRIPT_DIRECTION}")
-            print(f"   DEBUG_MODE: {config.DEBUG_MODE} (type: {type(config.DEBUG_MODE).__name__})")
-            print(f"   HA_MQTT_PORT: {config.HA_MQTT_PORT} (type: {type(config.HA_MQTT_PORT).__name__})")
-            print(f"   ENABLE_SPOT_SENSORS: {config.ENABLE_SPOT_SENSORS} (type: {type(config.ENABLE_SPOT_SENSORS).__name__})")
-            print(f"   SPOT_ALLOW_CALLSIGNS: {config.SPOT_ALLOW_CALLSIGNS} (type: {type(config.SPOT_ALLOW_CALLSIGNS).__name__})")
-            return True
-
-    except SystemExit as e:
-        if should_fail:
-            print("✅ PASSED: Configuration validation failed as expected")
-            return True
-        else:
-            print("❌ FAILED: Unexpected validation error")
-            return False
+        print("✅ PASSED: Configuration loaded successfully")
+        # Print some key values
+        print(proc.stdout, end="")
+        return True
 
-    finally:
-        # Restore original environment
-        for key, value in original_env.items():
-            if value is None:
-                os.environ.pop(key, None)
-            else:
-                os.environ[key] = value
+    if should_fail:
+        print("✅ PASSED: Configuration validation failed as expected")
+        return True
+    print("❌ FAILED: Unexpected validation error")
+    print(proc.stdout + proc.stderr, end="")
+    return False
 
 
 def main():
@@ -82,7 +80,7 @@ def main():
     results = []
 
     # Test 1: Minimal valid configuration
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Minimal Valid Configuration",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -92,7 +90,7 @@ def main():
     ))
 
     # Test 2: Full configuration with all options
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Full Configuration",
         {
             'MY_CALLSIGN': 'K2ABC',
@@ -114,7 +112,7 @@ def main():
     ))
 
     # Test 3: Missing MY_CALLSIGN (should fail)
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Missing MY_CALLSIGN (should fail)",
         {
             'HA_MQTT_BROKER': '192.168.1.100'
@@ -123,7 +121,7 @@ def main():
     ))
 
     # Test 4: Missing HA_MQTT_BROKER (should fail)
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Missing HA_MQTT_BROKER (should fail)",
         {
             'MY_CALLSIGN': 'W1AW'
@@ -132,7 +130,7 @@ def main():
     ))
 
     # Test 5: Invalid SCRIPT_DIRECTION (should fail)
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Invalid SCRIPT_DIRECTION (should fail)",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -143,7 +141,7 @@ def main():
     ))
 
     # Test 6: Invalid PSK_TRANSPORT_MODE (should fail)
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Invalid PSK_TRANSPORT_MODE (should fail)",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -154,7 +152,7 @@ def main():
     ))
 
     # Test 7: Invalid port number (should fail)
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Invalid Port Number (should fail)",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -165,7 +163,7 @@ def main():
     ))
 
     # Test 8: Boolean conversion variations
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Boolean Conversion Tests",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -178,7 +176,7 @@ def main():
     ))
 
     # Test 9: Empty list parsing
-    results.append(test_scenario(
+    results.append(run_scenario(
         "Empty List Parsing",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -190,7 +188,7 @@ def main():
     ))
 
     # Test 10: List with extra whitespace
-    results.append(test_scenario(
+    results.append(run_scenario(
         "List Parsing with Whitespace",
         {
             'MY_CALLSIGN': 'W1AW',
@@ -201,6 +199,39 @@ def main():
         should_fail=False
     ))
 
+    # Test 11: Invalid SPOT_SESSION_MAX (should fail)
+    results.append(run_scenario(
+        "Invalid SPOT_SESSION_MAX (should fail)",
+        {
+            'MY_CALLSIGN': 'W1AW',
+            'HA_MQTT_BROKER': '192.168.1.100',
+            'SPOT_SESSION_MAX': '0'
+        },
+        should_fail=True
+    ))
+
+    # Test 12: Non-numeric country code (should fail)
+    results.append(run_scenario(
+        "Non-numeric Country Code (should fail)",
+        {
+            'MY_CALLSIGN': 'W1AW',
+            'HA_MQTT_BROKER': '192.168.1.100',
+            'SPOT_FILTERED_COUNTRIES': '291, USA'
+        },
+        should_fail=True
+    ))
+
+    # Test 13: Non-ASCII digit in a country code (should fail)
+    results.append(run_scenario(
+        "Superscript Digit Country Code (should fail)",
+        {
+            'MY_CALLSIGN': 'W1AW',
+            'HA_MQTT_BROKER': '192.168.1.100',
+            'SPOT_ALLOW_COUNTRIES': '291, \u00b2'
+        },
+        should_fail=True
+    ))
+
     # Print summary
     print("\n" + "=" * 80)
     print("TEST SUMMARY")
@@ -217,5 +248,10 @@ def main():
         return 1
 
 
+def test_all_scenarios():
+    """Run the suite under pytest."""
+    assert main() == 0
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,106 @@
+"""Tests for the PSKReporter coordinator's spot filtering and aggregates."""
+
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("pyhamtools.locator")
+
+from custom_components.pskr.const import (  # noqa: E402
+    CONF_CALLSIGN,
+    CONF_CALLSIGN_ALLOW,
+    CONF_DIRECTION,
+    CONF_MAX_DISTANCE,
+    CONF_MODE_FILTER,
+    CONF_SAMPLE_RATE,
+    DIRECTION_RX,
+)
+from custom_components.pskr.coordinator import PSKReporterCoordinator  # noqa: E402
+
+TOPIC = "pskr/filter/v2/20m/FT8/{sender}/W1AW/0/0/0/0"
+
+
+def make_coordinator(options=None):
+    """Build a personal RX coordinator for W1AW without a running Home Assistant."""
+    entry = SimpleNamespace(
+        data={CONF_CALLSIGN: "W1AW", CONF_DIRECTION: DIRECTION_RX, "monitor_type": "personal"},
+        options=options or {},
+    )
+    return PSKReporterCoordinator(MagicMock(), entry)
+
+
+def spot_message(sender, sender_locator):
+    """Return (payload, topic) for a 20m FT8 spot of sender heard by W1AW in FN31."""
+    payload = {
+        "sq": 1, "f": 14074000, "md": "FT8", "rp": -10, "t": int(time.time()),
+        "sc": sender, "sl": sender_locator, "rc": "W1AW", "rl": "FN31pr",
+        "sa": 291, "ra": 291, "b": "20m",
+    }
+    return json.dumps(payload).encode(), TOPIC.format(sender=sender)
+
+
+def test_max_distance_rejects_distant_spot():
+    """A spot beyond the configured max distance is not stored."""
+    coordinator = make_coordinator({CONF_MAX_DISTANCE: 1000})
+
+    assert not coordinator._process_message(*spot_message("G4ABC", "IO91wm"))
+    assert coordinator._process_message(*spot_message("K1ABC", "FN42aa"))
+    assert [spot.sender_callsign for spot in coordinator._window.spots] == ["K1ABC"]
+
+
+def test_window_max_distance_tracks_stored_spots():
+    """The running max distance follows inserts and evictions of the spot holding it."""
+    coordinator = make_coordinator()
+    coordinator._process_message(*spot_message("K1ABC", "FN42aa"))
+    coordinator._process_message(*spot_message("G4ABC", "IO91wm"))
+    window = coordinator._window
+    near, far = (spot.distance_km for spot in window.spots)
+    assert window.max_distance == far
+
+    assert far > near
+
+    window._evict(window.spots.pop())
+    assert window.max_distance == near
+
+
+def test_consumer_thread_stores_spots_and_requests_one_refresh():
+    """The consumer decodes queued messages off the loop and notifies it once per burst."""
+    coordinator = make_coordinator()
+    for sender, locator in (("K1ABC", "FN42aa"), ("G4ABC", "IO91wm"), ("K2ABC", "FN20aa")):
+        coordinator._rx_queue.put(spot_message(sender, locator))
+    coordinator._rx_queue.put(None)
+
+    coordinator._consume_spot_queue()
+
+    assert [spot.sender_callsign for spot in coordinator._window.spots] == ["K1ABC", "G4ABC", "K2ABC"]
+    coordinator.hass.loop.call_soon_threadsafe.assert_called_once_with(coordinator._request_refresh)
+
+
+def test_clean_refresh_reuses_statistics():
+    """Without new or expired spots a refresh keeps the previous snapshot."""
+    coordinator = make_coordinator()
+    coordinator._process_message(*spot_message("K1ABC", "FN42aa"))
+    coordinator.data = coordinator._calculate_statistics()
+    assert coordinator.data.total_spots == 1
+
+    again = coordinator._calculate_statistics()
+    assert again.spots is coordinator.data.spots
+
+
+def test_portable_callsign_passes_topic_prefilter():
+    """An allow-listed portable call reaches the spot filter despite its topic spelling."""
+    coordinator = make_coordinator(
+        {CONF_CALLSIGN_ALLOW: ["K1ABC/P"], CONF_MODE_FILTER: ["FT8"], CONF_SAMPLE_RATE: 1}
+    )
+    payload, _topic = spot_message("K1ABC/P", "FN42aa")
+    msg = SimpleNamespace(payload=payload, topic=TOPIC.format(sender="K1ABC.P"))
+
+    coordinator._on_message(None, None, msg)
+
+    assert coordinator._health.topic_filtered == 0
+    assert coordinator._process_message(*coordinator._rx_queue.get_nowait())
+    assert [spot.sender_callsign for spot in coordinator._window.spots] == ["K1ABC/P"]